@@ -0,0 +1,133 @@
+"""added city and city alias
+
+Revision ID: 1e6b8d3f9a57
+Revises: f4a9c3e7b2d6
+Create Date: 2026-10-17 16:40:19.657302
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e6b8d3f9a57'
+down_revision: Union[str, Sequence[str], None] = 'f4a9c3e7b2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Municipalities of Montenegro and other spellings or places of them found in
+# job locations
+CITIES: dict[str, list[str]] = {
+    "Andrijevica": [],
+    "Bar": ["Sutomore", "Stari Bar", "Virpazar"],
+    "Berane": [],
+    "Bijelo Polje": ["B. Polje"],
+    "Budva": ["Bečići", "Petrovac", "Petrovac na Moru", "Sveti Stefan"],
+    "Cetinje": [],
+    "Danilovgrad": [],
+    "Gusinje": [],
+    "Herceg Novi": ["Hercegnovi", "Igalo", "Meljine", "Bijela"],
+    "Kolašin": [],
+    "Kotor": ["Dobrota", "Prčanj", "Risan"],
+    "Mojkovac": [],
+    "Nikšić": [],
+    "Petnjica": [],
+    "Plav": [],
+    "Pljevlja": [],
+    "Plužine": [],
+    "Podgorica": ["PG"],
+    "Rožaje": [],
+    "Šavnik": [],
+    "Tivat": [],
+    "Tuzi": [],
+    "Ulcinj": ["Ada Bojana"],
+    "Zeta": ["Golubovci"],
+    "Žabljak": [],
+}
+
+
+def normalize_location(location: str) -> str:
+    # Same as app.cities.normalize_location at the time of this migration
+    location = location.lower().translate(str.maketrans("čćšžđ", "ccszd"))
+    return " ".join(location.replace("-", " ").split())
+
+
+def resolve_city(location: str, aliases: dict[str, int]) -> int | None:
+    # Same as app.cities.CityResolver.resolve at the time of this migration
+    city_id = aliases.get(normalize_location(location))
+    if city_id is not None:
+        return city_id
+    for part in re.split(r"[,/;|()]", location):
+        city_id = aliases.get(normalize_location(part))
+        if city_id is not None:
+            return city_id
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    city = op.create_table(
+        'city',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    city_alias = op.create_table(
+        'city_alias',
+        sa.Column('alias', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('city_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['city_id'], ['city.id']),
+        sa.PrimaryKeyConstraint('alias'),
+    )
+    op.create_index(
+        op.f('ix_city_alias_city_id'), 'city_alias', ['city_id'], unique=False
+    )
+    op.add_column('job', sa.Column('city_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('job_city_id_fkey', 'job', 'city', ['city_id'], ['id'])
+    op.create_index(op.f('ix_job_city_id'), 'job', ['city_id'], unique=False)
+
+    op.bulk_insert(
+        city, [{'id': i, 'name': name} for i, name in enumerate(CITIES, start=1)]
+    )
+    op.execute("SELECT setval('city_id_seq', (SELECT max(id) FROM city))")
+
+    aliases: dict[str, int] = {}
+    for i, (name, other_names) in enumerate(CITIES.items(), start=1):
+        for alias in [name, *other_names]:
+            aliases.setdefault(normalize_location(alias), i)
+    op.bulk_insert(
+        city_alias,
+        [{'alias': alias, 'city_id': city_id} for alias, city_id in aliases.items()],
+    )
+
+    # Jobs stored so far, resolved like the scrapers resolve new ones. Each
+    # distinct location is resolved once and its jobs updated together
+    connection = op.get_bind()
+    locations = connection.execute(
+        sa.text("SELECT DISTINCT location FROM job WHERE location IS NOT NULL")
+    ).scalars()
+    cities = [
+        {'location': location, 'city_id': city_id}
+        for location in locations
+        if (city_id := resolve_city(location, aliases)) is not None
+    ]
+    if cities:
+        connection.execute(
+            sa.text("UPDATE job SET city_id = :city_id WHERE location = :location"),
+            cities,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_city_id'), table_name='job')
+    op.drop_constraint('job_city_id_fkey', 'job', type_='foreignkey')
+    op.drop_column('job', 'city_id')
+    op.drop_index(op.f('ix_city_alias_city_id'), table_name='city_alias')
+    op.drop_table('city_alias')
+    op.drop_table('city')
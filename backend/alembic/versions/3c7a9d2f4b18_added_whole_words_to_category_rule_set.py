@@ -0,0 +1,28 @@
+"""added whole words to category rule set
+
+Revision ID: 3c7a9d2f4b18
+Revises: 1e6b8d3f9a57
+Create Date: 2026-10-17 18:12:36.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7a9d2f4b18'
+down_revision: Union[str, Sequence[str], None] = '1e6b8d3f9a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('category_rule_set', sa.Column('whole_words', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('category_rule_set', 'whole_words')
@@ -0,0 +1,33 @@
+"""added content_hash to job
+
+Revision ID: 5d7e1c9a3b20
+Revises: 2ea3433fb522
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e1c9a3b20'
+down_revision: Union[str, Sequence[str], None] = '2ea3433fb522'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored jobs start without a hash, next scrape of each one fills it in
+    op.add_column(
+        'job',
+        sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job', 'content_hash')
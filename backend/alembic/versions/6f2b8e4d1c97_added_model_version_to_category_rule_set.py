@@ -0,0 +1,29 @@
+"""added model version to category rule set
+
+Revision ID: 6f2b8e4d1c97
+Revises: 3c7a9d2f4b18
+Create Date: 2026-10-17 21:04:52.118340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2b8e4d1c97'
+down_revision: Union[str, Sequence[str], None] = '3c7a9d2f4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('category_rule_set', sa.Column('model_version', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('category_rule_set', 'model_version')
@@ -0,0 +1,28 @@
+"""added index on job expires
+
+Revision ID: 7b3f0e6d2a41
+Revises: 5d7e1c9a3b20
+Create Date: 2026-10-17 10:05:48.913274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3f0e6d2a41'
+down_revision: Union[str, Sequence[str], None] = '5d7e1c9a3b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expired jobs cleanup looks jobs up by expires
+    op.create_index(op.f('ix_job_expires'), 'job', ['expires'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_expires'), table_name='job')
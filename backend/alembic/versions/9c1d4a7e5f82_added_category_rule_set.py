@@ -0,0 +1,56 @@
+"""added category rule set
+
+Revision ID: 9c1d4a7e5f82
+Revises: 7b3f0e6d2a41
+Create Date: 2026-10-17 11:31:07.264519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1d4a7e5f82'
+down_revision: Union[str, Sequence[str], None] = '7b3f0e6d2a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'category_rule_set',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('keywords', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('version'),
+    )
+    op.add_column(
+        'job',
+        sa.Column('category_version', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    # Titles holding changed keywords are found through this index, must
+    # match TITLE_TOKENS_SQL in app/models/job.py
+    op.create_index(
+        'ix_job_title_tokens',
+        'job',
+        [sa.text(r"to_tsvector('simple', translate(title, '/.\@:', '     '))")],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.create_index(
+        op.f('ix_categoryjoblink_job_id'), 'categoryjoblink', ['job_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_categoryjoblink_job_id'), table_name='categoryjoblink')
+    op.drop_index('ix_job_title_tokens', table_name='job')
+    op.drop_column('job', 'category_version')
+    op.drop_table('category_rule_set')
@@ -0,0 +1,45 @@
+"""added trigram indexes on job
+
+Revision ID: d2e8b5c6f1a9
+Revises: 9c1d4a7e5f82
+Create Date: 2026-10-17 13:48:22.530671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e8b5c6f1a9'
+down_revision: Union[str, Sequence[str], None] = '9c1d4a7e5f82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fuzzy title search (<%) and ILIKE filters on title and location use
+    # these, pg_trgm is enabled in a8f4e2b19c3d
+    op.create_index(
+        'ix_job_title_trgm',
+        'job',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_job_location_trgm',
+        'job',
+        ['location'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'location': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_location_trgm', table_name='job')
+    op.drop_index('ix_job_title_trgm', table_name='job')
@@ -0,0 +1,56 @@
+"""added weighted search vector to job
+
+Revision ID: f4a9c3e7b2d6
+Revises: d2e8b5c6f1a9
+Create Date: 2026-10-17 15:02:44.118903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9c3e7b2d6'
+down_revision: Union[str, Sequence[str], None] = 'd2e8b5c6f1a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Text search config that drops diacritics, "vozac" matches "vozač"
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE TEXT SEARCH CONFIGURATION job_search (COPY = simple)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION job_search "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple"
+    )
+
+    # Kept up to date by Postgres, title weighs most and description least.
+    # Must match SEARCH_VECTOR_SQL in app/models/job.py
+    op.execute(
+        """
+        ALTER TABLE job ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('job_search', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('job_search', coalesce(company, '')), 'B')
+            || setweight(to_tsvector('job_search', coalesce(description, '')), 'C')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_job_search_vector',
+        'job',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_search_vector', table_name='job')
+    op.drop_column('job', 'search_vector')
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS job_search")
+    op.execute("DROP EXTENSION IF EXISTS unaccent")
@@ -0,0 +1,253 @@
+"""Naive Bayes category model over hashed words of job title and description.
+
+Used for jobs whose titles hold no category keyword. The model is trained
+offline on jobs labeled by the keyword classifier, jobs matched only by
+NO_CATEGORY_KEYWORDS train the NO_CATEGORY class, and saved as a .npz file
+(CATEGORY_MODEL_PATH). Jobs without any keyword are the ones the model is
+asked about, so they are never trained on.
+Run from the backend directory:
+
+    python -m app.category_model --output .cache/category_model.npz
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_MODEL_PATH = os.getenv("CATEGORY_MODEL_PATH", ".cache/category_model.npz")
+
+# Number of hashed features, words sharing a slot are rare enough at this size
+N_FEATURES: int = 2**16
+# Words of the title count this many times, title says most about the job
+TITLE_WEIGHT: int = 3
+# Only the start of a description is read, it holds the job summary
+MAX_DESCRIPTION_WORDS: int = 200
+# Words are also counted by their first letters, so inflected forms of one
+# word ("konobar", "konobara", "konobaru") share a feature
+STEM_LENGTH: int = 6
+# Jobs whose best category is less likely than this get no category
+MIN_CONFIDENCE: float = 0.6
+# Class of jobs known to fit no category. Posteriors of Naive Bayes are near
+# 1 for any job with a long description, so the confidence alone rarely
+# leaves a job out. A job has to look more like a categorized job than like
+# an uncategorized one to get a category. Jobs without any keyword don't
+# train it, they are mostly jobs the keywords miss and the class would learn
+# to keep exactly those jobs from getting a category
+NO_CATEGORY: str = ""
+
+WORD_RE = re.compile(r"\w{2,}")
+
+
+def tokenize(text: str | None) -> List[str]:
+    tokens = []
+    for word in WORD_RE.findall((text or "").lower()):
+        tokens.append(word)
+        if len(word) > STEM_LENGTH:
+            tokens.append(word[:STEM_LENGTH] + "*")
+    return tokens
+
+
+@lru_cache(maxsize=100_000)
+def feature_index(token: str, n_features: int) -> int:
+    # crc32 is stable between processes, unlike hash()
+    return zlib.crc32(token.encode()) % n_features
+
+
+def job_features(title: str, description: str | None, n_features: int) -> List[int]:
+    """Hashed features of a job, title words count TITLE_WEIGHT times"""
+    tokens = tokenize(title) * TITLE_WEIGHT
+    tokens += tokenize(description)[:MAX_DESCRIPTION_WORDS]
+    return [feature_index(token, n_features) for token in tokens]
+
+
+class CategoryModel:
+    """Multinomial Naive Bayes over hashed word counts
+
+    Args:
+        categories(list): category names, one per column of log_likelihood
+        log_prior(np.ndarray): log probability of each category
+        log_likelihood(np.ndarray): log probability of each feature given
+            the category, shaped (N_FEATURES, categories)
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[str],
+        log_prior: np.ndarray,
+        log_likelihood: np.ndarray,
+    ) -> None:
+        self.categories = list(categories)
+        self.log_prior = log_prior
+        self.log_likelihood = log_likelihood
+        self.version = hashlib.sha256(log_likelihood.tobytes()).hexdigest()
+
+    def predict(self, jobs: Sequence[tuple[str, str | None]]) -> List[str | None]:
+        """Function to find the most likely category of each job
+
+        Log likelihoods of all jobs' features are gathered into one array and
+        summed per job, so the batch is scored in a few numpy operations.
+
+        Args:
+            jobs(list): title and description of jobs
+
+        Returns:
+            category name per job, None when NO_CATEGORY is the most likely
+            or the model is not confident
+        """
+        if not jobs:
+            return []
+
+        n_features = self.log_likelihood.shape[0]
+        features = [
+            job_features(title, description, n_features) for title, description in jobs
+        ]
+        lengths = np.array([len(f) for f in features])
+        scores = np.tile(self.log_prior, (len(jobs), 1))
+
+        has_words = lengths > 0
+        if has_words.any():
+            flat = np.fromiter((i for f in features for i in f), dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum(lengths[has_words])[:-1]))
+            scores[has_words] += np.add.reduceat(self.log_likelihood[flat], offsets)
+
+        # Posterior of the best category, softmax of the log scores
+        scores -= scores.max(axis=1, keepdims=True)
+        posterior = np.exp(scores)
+        posterior /= posterior.sum(axis=1, keepdims=True)
+
+        best = posterior.argmax(axis=1)
+        confident = (posterior.max(axis=1) >= MIN_CONFIDENCE) & has_words
+        names = [self.categories[index] for index in best]
+        return [
+            name if ok and name != NO_CATEGORY else None
+            for name, ok in zip(names, confident)
+        ]
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            categories=np.array(self.categories),
+            log_prior=self.log_prior,
+            log_likelihood=self.log_likelihood,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CategoryModel":
+        with np.load(path) as data:
+            return cls(
+                [str(name) for name in data["categories"]],
+                data["log_prior"],
+                data["log_likelihood"],
+            )
+
+
+def train(
+    jobs: Iterable[tuple[str, str | None, Iterable[str]]],
+    n_features: int = N_FEATURES,
+    alpha: float = 1.0,
+) -> CategoryModel:
+    """Function to fit the model on labeled jobs
+
+    Args:
+        jobs(iterable): title, description and category names of each job,
+            NO_CATEGORY for a job known to fit none, a job with more
+            categories counts once for each of them and a job with no names
+            is skipped
+        n_features(int): number of hashed features
+        alpha(float): additive smoothing of word counts
+
+    Returns:
+        trained model
+    """
+    columns: dict[str, int] = {}
+    jobs_per_column: list[int] = []
+    rows: list[int] = []
+    cols: list[int] = []
+
+    for title, description, categories in jobs:
+        if not categories:
+            continue
+        features = job_features(title, description, n_features)
+        for category in categories:
+            column = columns.setdefault(category, len(columns))
+            if column == len(jobs_per_column):
+                jobs_per_column.append(0)
+            jobs_per_column[column] += 1
+            rows.extend(features)
+            cols.extend([column] * len(features))
+
+    if not columns.keys() - {NO_CATEGORY}:
+        raise ValueError("No labeled jobs to train on")
+
+    counts = np.zeros((n_features, len(columns)))
+    np.add.at(counts, (np.array(rows), np.array(cols)), 1)
+
+    log_prior = np.log(np.array(jobs_per_column) / sum(jobs_per_column))
+    totals = counts.sum(axis=0)
+    log_likelihood = np.log(counts + alpha) - np.log(totals + alpha * n_features)
+
+    return CategoryModel(list(columns), log_prior, log_likelihood)
+
+
+@lru_cache(maxsize=1)
+def get_category_model() -> CategoryModel | None:
+    """Return model from CATEGORY_MODEL_PATH, None when it was not trained"""
+    if not os.path.exists(CATEGORY_MODEL_PATH):
+        logger.info(f"No category model at {CATEGORY_MODEL_PATH}, keywords only")
+        return None
+    return CategoryModel.load(CATEGORY_MODEL_PATH)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=CATEGORY_MODEL_PATH)
+    parser.add_argument("--features", type=int, default=N_FEATURES)
+    args = parser.parse_args()
+
+    # Imported here, loading the model needs no database settings
+    from app.classifier import KeywordClassifier
+    from app.db import SessionLocal
+    from app.models import Job
+    from app.models.utils import CATEGORY_KEYWORDS, NO_CATEGORY_KEYWORDS
+    from sqlmodel import select
+
+    logging.basicConfig(level=logging.INFO)
+    classifier = KeywordClassifier(CATEGORY_KEYWORDS)
+    negatives = KeywordClassifier({NO_CATEGORY: NO_CATEGORY_KEYWORDS}, whole_words=[])
+    session = SessionLocal()
+    # Jobs without any keyword, the model was not trained on them
+    unlabeled: list[tuple[str, str | None]] = []
+
+    def labeled_jobs():
+        query = select(Job.title, Job.description).execution_options(yield_per=1000)
+        for title, description in session.exec(query):
+            categories = classifier.classify(title) or negatives.classify(title)
+            if not categories:
+                unlabeled.append((title, description))
+            yield title, description, categories
+
+    try:
+        model = train(labeled_jobs(), n_features=args.features)
+    finally:
+        session.close()
+
+    model.save(args.output)
+    categories_count = len([name for name in model.categories if name])
+    print(f"Saved model of {categories_count} categories to {args.output}")
+
+    covered = sum(name is not None for name in model.predict(unlabeled))
+    print(f"{covered} of {len(unlabeled)} jobs without keywords get a category")
+
+
+if __name__ == "__main__":
+    main()
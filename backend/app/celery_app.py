@@ -37,6 +37,14 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.scrape_all_jobs",
         "schedule": crontab(hour=17, minute=0),
     },
+    "prune-scraper-caches": {
+        "task": "app.tasks.prune_scraper_caches",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "resolve-job-cities": {
+        "task": "app.tasks.resolve_job_cities",
+        "schedule": crontab(hour=4, minute=30),
+    },
 }
 
 celery_app.autodiscover_tasks(["app.tasks"])
@@ -0,0 +1,76 @@
+import logging
+import os
+import re
+import threading
+import time
+
+from app.models.job import CityAlias
+from sqlmodel import Session, select
+
+logger = logging.getLogger(__name__)
+
+# Latin letters with diacritics are compared without them, portals spell
+# "Nikšić" as "Niksic" as well. The city_alias backfill migration folds them
+# the same way
+DIACRITICS = str.maketrans("čćšžđ", "ccszd")
+
+# Seconds a process keeps the aliases it read, aliases added later are used
+# once they are read again
+CITY_ALIASES_MAX_AGE: float = float(os.getenv("CITY_ALIASES_MAX_AGE", "600"))
+
+# Location holding more places, "Podgorica, Crna Gora" or "Budva / Kotor"
+LOCATION_SEPARATORS = re.compile(r"[,/;|()]")
+
+
+def normalize_location(location: str) -> str:
+    """Key of a location string in the city_alias table"""
+    location = location.lower().translate(DIACRITICS)
+    return " ".join(location.replace("-", " ").split())
+
+
+class CityResolver:
+    """Maps free text locations of the portals to canonical cities
+
+    Args:
+        aliases(dict): normalized location to city id
+    """
+
+    def __init__(self, aliases: dict[str, int]) -> None:
+        self.aliases = aliases
+
+    def resolve(self, location: str | None) -> int | None:
+        """Id of the city of the location, the first known place wins when it
+        lists more, None when no place is known"""
+        if not location:
+            return None
+
+        city_id = self.aliases.get(normalize_location(location))
+        if city_id is not None:
+            return city_id
+
+        for part in LOCATION_SEPARATORS.split(location):
+            city_id = self.aliases.get(normalize_location(part))
+            if city_id is not None:
+                return city_id
+        return None
+
+
+_resolver: CityResolver | None = None
+_resolver_loaded_at: float = 0.0
+_resolver_lock = threading.Lock()
+
+
+def get_city_resolver(
+    session: Session, max_age: float = CITY_ALIASES_MAX_AGE
+) -> CityResolver:
+    """Return resolver of the current process, aliases are read on first use
+    and again once they are older than max_age seconds"""
+    global _resolver, _resolver_loaded_at
+
+    with _resolver_lock:
+        if _resolver is None or time.monotonic() - _resolver_loaded_at >= max_age:
+            rows = session.exec(select(CityAlias.alias, CityAlias.city_id)).all()
+            _resolver = CityResolver(dict(rows))
+            _resolver_loaded_at = time.monotonic()
+            logger.info(f"Loaded {len(rows)} city aliases")
+        return _resolver
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import re
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from app.models.utils import CATEGORY_KEYWORDS, WHOLE_WORD_KEYWORDS
+
+if TYPE_CHECKING:
+    from app.category_model import CategoryModel
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum()
+
+
+def rule_set_version(
+    keywords: dict[str, list[str]],
+    whole_words: Iterable[str],
+    model_version: str | None = None,
+) -> str:
+    """Hash of the keywords, matching rules and fallback model, changes with
+    any of them"""
+    rules = {
+        "keywords": keywords,
+        "whole_words": sorted(whole_words),
+        "model": model_version,
+    }
+    data = json.dumps(rules, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def changed_keywords(old: dict[str, list[str]], new: dict[str, list[str]]) -> set[str]:
+    """Function to find keywords added to or removed from any category
+
+    Only titles holding one of these keywords can be classified differently
+    by the new rule set.
+
+    Args:
+        old(dict): category name to keywords of the previous rule set
+        new(dict): category name to keywords of the current rule set
+
+    Returns:
+        lowercased keywords
+    """
+
+    def pairs(keywords: dict[str, list[str]]) -> set[tuple[str, str]]:
+        return {
+            (category, keyword.lower())
+            for category, category_keywords in keywords.items()
+            for keyword in category_keywords
+        }
+
+    return {keyword for _, keyword in pairs(old) ^ pairs(new)}
+
+
+def keyword_tsquery(keywords: set[str], whole_words: set[str]) -> str:
+    """Postgres tsquery matching titles that hold any of the keywords. Words
+    of a keyword follow each other and the last one is a prefix, except for
+    keywords in whole_words"""
+    queries = []
+    for keyword in sorted(keywords):
+        words = re.findall(r"\w+", keyword)
+        if not words:
+            continue
+        query = " <-> ".join(words)
+        if keyword not in whole_words:
+            query += ":*"
+        queries.append(f"({query})")
+    return " | ".join(queries)
+
+
+class KeywordClassifier:
+    """Finds categories of a job title with one pass over the title.
+
+    Keywords of all categories are compiled into an Aho-Corasick automaton,
+    every keyword occurring in the title is found in a single scan whatever
+    the number of keywords. A keyword counts only when it starts a word, and
+    one of whole_words only when it also ends there.
+
+    Args:
+        keywords(dict): category name to its keywords
+        model(CategoryModel): model that picks a category from title and
+            description of jobs without any keyword, None to skip them
+        whole_words(iterable): keywords matched only as a whole word
+    """
+
+    def __init__(
+        self,
+        keywords: dict[str, list[str]],
+        model: "CategoryModel | None" = None,
+        whole_words: Iterable[str] = WHOLE_WORD_KEYWORDS,
+    ) -> None:
+        # Trie transitions, failure links and keywords ending in each state
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[str]] = [[]]
+        self._categories: dict[str, set[str]] = {}
+        self.keywords = keywords
+        self.whole_words = {keyword.lower() for keyword in whole_words}
+        self.model = model
+        self.version = rule_set_version(
+            keywords, self.whole_words, model.version if model else None
+        )
+
+        for category, category_keywords in keywords.items():
+            for keyword in category_keywords:
+                keyword = keyword.lower()
+                self._categories.setdefault(keyword, set()).add(category)
+                self._add(keyword)
+
+        self._link()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+
+        if keyword not in self._output[state]:
+            self._output[state].append(keyword)
+
+    def _link(self) -> None:
+        """Set failure links breadth first, a state falls back to the longest
+        suffix of its path that is also a path in the trie"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Keywords ending at the suffix end here as well
+                self._output[child] += self._output[self._fail[child]]
+
+    def matches(self, text: str) -> Iterator[str]:
+        """Yield keywords found in text that stand at the start of a word"""
+        text = text.lower()
+        state = 0
+
+        for end, char in enumerate(text, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for keyword in self._output[state]:
+                start = end - len(keyword)
+                if start > 0 and is_word_char(text[start - 1]):
+                    continue
+                if (
+                    keyword in self.whole_words
+                    and end < len(text)
+                    and is_word_char(text[end])
+                ):
+                    continue
+                yield keyword
+
+    def classify(self, title: str) -> set[str]:
+        """Return names of categories whose keywords are found in the title"""
+        return {
+            category
+            for keyword in self.matches(title)
+            for category in self._categories[keyword]
+        }
+
+    def classify_jobs(self, jobs: list[tuple[str, str | None]]) -> list[set[str]]:
+        """Function to find categories of a batch of jobs
+
+        Args:
+            jobs(list): title and description of jobs
+
+        Returns:
+            category names per job, from keywords of the title or, when the
+            title has none, from the model scoring all such jobs at once
+        """
+        categories = [self.classify(title) for title, _ in jobs]
+        if self.model is None:
+            return categories
+
+        missed = [i for i, found in enumerate(categories) if not found]
+        predicted = self.model.predict([jobs[i] for i in missed])
+        for i, category in zip(missed, predicted):
+            if category is not None:
+                categories[i] = {category}
+        return categories
+
+
+@lru_cache(maxsize=1)
+def get_classifier() -> KeywordClassifier:
+    """Return classifier for CATEGORY_KEYWORDS with the trained fallback model,
+    built once per process"""
+    # Imported here, web workers import this module through the tasks and
+    # never classify, so they don't load numpy
+    from app.category_model import get_category_model
+
+    return KeywordClassifier(CATEGORY_KEYWORDS, get_category_model())
@@ -1,3 +1,3 @@
-from app.models.job import Job, Category
+from app.models.job import Job, Category, City
 
-__all__ = ["Job", "Category"]
+__all__ = ["Job", "Category", "City"]
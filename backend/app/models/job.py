@@ -1,11 +1,29 @@
-from datetime import date
+from datetime import date, datetime
 
+from sqlalchemy import DDL, JSON, Column, Computed, Index, event, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel
 
+# Words of a job title for full text matching of category keywords. Slashes,
+# dots and the like are turned into spaces first, so "Kuvar/Konobar" gives
+# two words like it does for the keyword classifier
+TITLE_TOKENS_SQL = r"to_tsvector('simple', translate(title, '/.\@:', '     '))"
+
+# Words of title, company and description for job search, title weighs most
+# and description least. Must match migration f4a9c3e7b2d6
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('job_search', coalesce(title, '')), 'A') "
+    "|| setweight(to_tsvector('job_search', coalesce(company, '')), 'B') "
+    "|| setweight(to_tsvector('job_search', coalesce(description, '')), 'C')"
+)
+
 
 class CategoryJobLink(SQLModel, table=True):
     category_id: int | None = Field(default=None, foreign_key="category.id", primary_key=True)
-    job_id: int | None = Field(default=None, foreign_key="job.id", primary_key=True)
+    # Primary key starts with category_id, links of a job need their own index
+    job_id: int | None = Field(
+        default=None, foreign_key="job.id", primary_key=True, index=True
+    )
 
 
 class Category(SQLModel, table=True):
@@ -18,8 +36,56 @@ class Category(SQLModel, table=True):
     )
 
 
+class CategoryRuleSet(SQLModel, table=True):
+    """Category keywords used to classify jobs, stored on every change"""
+
+    __tablename__ = "category_rule_set"  # type: ignore
+
+    id: int | None = Field(default=None, primary_key=True)
+    version: str = Field(unique=True)
+    keywords: dict = Field(sa_column=Column(JSON, nullable=False))
+    # Keywords matched only as a whole word, None for rule sets stored before
+    whole_words: list | None = Field(default=None, sa_column=Column(JSON))
+    # Version of the fallback category model, None when there was none
+    model_version: str | None = None
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+class City(SQLModel, table=True):
+    __tablename__ = "city"  # type: ignore
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field(unique=True)
+
+
+class CityAlias(SQLModel, table=True):
+    """Spelling of a city in job locations, normalized by
+    app.cities.normalize_location"""
+
+    __tablename__ = "city_alias"  # type: ignore
+
+    alias: str = Field(primary_key=True)
+    city_id: int = Field(foreign_key="city.id", index=True)
+
+
 class Job(SQLModel, table=True):
     __tablename__ = "job"  # type: ignore
+    __table_args__ = (
+        Index("ix_job_title_tokens", text(TITLE_TOKENS_SQL), postgresql_using="gin"),
+        # Trigram indexes serve fuzzy title search and ILIKE filters
+        Index(
+            "ix_job_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_job_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     title: str = Field(index=True)
@@ -27,10 +93,49 @@ class Job(SQLModel, table=True):
     url: str = Field(unique=True)
     location: str = Field()
     date_posted: date | None = Field(default_factory=None)
-    expires: date | None = Field(default_factory=None)
+    expires: date | None = Field(default_factory=None, index=True)
     img: str = Field()
     source: str = Field()
     categories: list["Category"] = Relationship(
         back_populates="jobs", link_model=CategoryJobLink
     )
     description: str | None = Field(default_factory=None)
+    # Hash of title, company, location, expires and description, see
+    # app.scrapers.base.Job.content_hash
+    content_hash: str | None = Field(default=None)
+    # Version of the category rule set that assigned the job's categories
+    category_version: str | None = Field(default=None)
+    # Canonical city of location, None when location names no known city
+    city_id: int | None = Field(default=None, foreign_key="city.id", index=True)
+
+
+# Kept up to date by Postgres and declared on the table only, not mapped on
+# Job, so migrations and create_all know it while ORM queries don't load it
+Job.__table__.append_column(  # type: ignore[attr-defined]
+    Column("search_vector", TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))
+)
+Index(
+    "ix_job_search_vector",
+    Job.__table__.c.search_vector,  # type: ignore[attr-defined]
+    postgresql_using="gin",
+)
+
+# Extensions and text search config the job table needs, created by the
+# migrations and here for create_all. job_search drops diacritics, so
+# "vozac" matches "vozač"
+event.listen(
+    Job.__table__,
+    "before_create",
+    DDL("""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE EXTENSION IF NOT EXISTS unaccent;
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT FROM pg_ts_config WHERE cfgname = 'job_search')
+            THEN
+                CREATE TEXT SEARCH CONFIGURATION job_search (COPY = simple);
+                ALTER TEXT SEARCH CONFIGURATION job_search
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+            END IF;
+        END $$;
+        """),
+)
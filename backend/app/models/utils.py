@@ -272,6 +272,31 @@ CATEGORY_KEYWORDS = {
     ],
 }
 
+# Keywords matched only as a whole word. They are abbreviations or short
+# words found at the start of unrelated ones, "sud" in "sudopera" or "pr" in
+# "prodavac". Other keywords are word stems and match at the start of a word
+WHOLE_WORD_KEYWORDS = ["sud", "pr", "it", "hr", "qa", "seo", "bpo"]
+
+# Keywords of jobs that belong to none of the categories. Titles holding one
+# of them, and no category keyword, train the category model's NO_CATEGORY
+# class, so it learns what an uncategorized job looks like from known ones
+NO_CATEGORY_KEYWORDS = [
+    "poljoprivred",
+    "berač",
+    "farmer",
+    "vrtlar",
+    "baštovan",
+    "ribar",
+    "sport",
+    "trener",
+    "fitness",
+    "animator",
+    "dadilja",
+    "njegovatelj",
+    "fotograf",
+    "volonter",
+]
+
 
 def create_categories():
     session: Session = SessionLocal()
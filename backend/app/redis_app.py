@@ -15,6 +15,12 @@ redis = Redis(
 JOB_CACHE_KEY: str = "list:jobs"
 JOB_CACHE_TTL: int = 86400
 
+LAST_PAGE_CACHE_KEY: str = "scraper:last_page:{source}"
+LAST_PAGE_CACHE_TTL: int = 6 * 3600
+
+PAGE_COST_CACHE_KEY: str = "scraper:page_cost:{source}"
+PAGE_COST_CACHE_TTL: int = 7 * 86400
+
 
 def set_jobs_cache(jobs: Sequence[Job]):
     redis.set(
@@ -31,3 +37,27 @@ def get_jobs_cache() -> List[Job] | None:
 
     job_dicts = json.loads(cached_jobs)
     return [Job(**job_dict) for job_dict in job_dicts]
+
+
+def set_last_page_cache(source: str, last_page: int):
+    redis.set(
+        LAST_PAGE_CACHE_KEY.format(source=source), last_page, ex=LAST_PAGE_CACHE_TTL
+    )
+
+
+def get_last_page_cache(source: str) -> int | None:
+    last_page = redis.get(LAST_PAGE_CACHE_KEY.format(source=source))
+    return int(last_page) if last_page else None
+
+
+def set_page_cost_cache(source: str, seconds: float):
+    redis.set(
+        PAGE_COST_CACHE_KEY.format(source=source),
+        round(seconds, 3),
+        ex=PAGE_COST_CACHE_TTL,
+    )
+
+
+def get_page_cost_cache(source: str) -> float | None:
+    page_cost = redis.get(PAGE_COST_CACHE_KEY.format(source=source))
+    return float(page_cost) if page_cost else None
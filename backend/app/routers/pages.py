@@ -1,5 +1,7 @@
+from urllib.parse import quote_plus
+
 from app.db import get_session
-from app.models.job import Job
+from app.models.job import City, Job
 from app.routers.utils import (
     get_cached_jobs,
     get_categories,
@@ -106,9 +108,11 @@ def sitemap(session: Session = Depends(get_session)):
     """Generate XML sitemap for search engines"""
     from datetime import datetime
 
-    # Get all unique cities
+    # Get all cities with jobs
     cities_result = session.exec(
-        select(Job.location).distinct().where(Job.location.is_not(None))
+        select(City.name)
+        .where(select(Job.id).where(Job.city_id == City.id).exists())
+        .order_by(City.name)
     ).all()
 
     # Build sitemap XML
@@ -137,7 +141,7 @@ def sitemap(session: Session = Depends(get_session)):
     # City-specific job search pages
     for city in cities_result:
         if city:
-            city_clean = city.strip()
+            city_clean = quote_plus(city)
             urls.append(f"""
     <url>
         <loc>{base_url}/poslovi?city={city_clean}</loc>
@@ -1,10 +1,27 @@
-from app.models.job import Category, CategoryJobLink, Job
+from app.cities import get_city_resolver
+from app.models.job import Category, CategoryJobLink, City, Job
 from app.redis_app import get_jobs_cache, set_jobs_cache
 from app.scrapers.base import Job as JobBase
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 from sqlalchemy.sql import func
 from sqlmodel import Session, select
 
+# Least word similarity of the searched title to a job title for a match,
+# in 0 to 1, lower finds more misspelled titles
+TITLE_MATCH_THRESHOLD: float = 0.4
+
+# Cities shown on the homepage with their pictures, in display order
+FEATURED_CITIES: dict[str, str] = {
+    "Podgorica": "images/cities/podgorica.jpg",
+    "Budva": "images/cities/budva.webp",
+    "Herceg Novi": "images/cities/herceg-novi.jpg",
+    "Tivat": "images/cities/tivat.avif",
+    "Kotor": "images/cities/kotor.jpg",
+}
+
+# Mapped columns of Job, search queries leave out the search_vector column
+JOB_COLUMNS = ", ".join(f"job.{column.name}" for column in inspect(Job).columns)
+
 
 def get_queried_jobs(
     *,
@@ -15,12 +32,15 @@ def get_queried_jobs(
     offset: int | None = None,
     session: Session,
 ):
-    """Query jobs using PostgreSQL fuzzy search with trigram similarity.
+    """Query jobs using PostgreSQL full text search and trigram similarity.
 
         Searches for jobs by title and/or city using advanced PostgreSQL features:
-        - Trigram similarity for fuzzy matching (handles typos)
+        - Full text search over title, company and description, ignoring
+          diacritics ("vozac" finds "vozač")
+        - Trigram word similarity for fuzzy matching (handles typos)
         - ILIKE pattern matching for substring searches
-        Results are ordered by relevance (similarity score).
+        All are answered by GIN indexes on search_vector, title and location.
+        Results are ordered by relevance (text rank plus similarity score).
 
         Args:
             title: Job title search term. Supports fuzzy matching and partial
@@ -41,18 +61,45 @@ def get_queried_jobs(
     query = select(Job)
     fetch_limit = limit + 1
 
-    if title and city:
-        sql = text("""
-                   SELECT * FROM job
-                   WHERE (similarity(title, :title) > 0.1 OR title ILIKE :title_pattern)
-                   AND location ILIKE :location
-                   ORDER BY similarity(title, :title) DESC
+    # Known city is an equality lookup on the city_id index, any other text
+    # is matched in location
+    city_id = get_city_id(city, session=session) if city else None
+    if city_id is not None:
+        city_filter = "AND city_id = :city_id"
+    elif city:
+        city_filter = "AND location ILIKE :location"
+    else:
+        city_filter = ""
+
+    if title:
+        # Threshold of the <% operator, local to the request's transaction
+        session.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, true)"),
+            {"t": str(TITLE_MATCH_THRESHOLD)},
+        )
+        # Words are matched in the weighted search_vector (title, company,
+        # description), misspelled and partial titles through the trigram
+        # index. Rank of the words and title similarity are both in 0 to 1
+        sql = text(f"""
+                   SELECT {JOB_COLUMNS}
+                   FROM job, websearch_to_tsquery('job_search', :title) AS query
+                   WHERE (
+                       search_vector @@ query
+                       OR :title <% title
+                       OR title ILIKE :title_pattern
+                   )
+                   {city_filter}
+                   ORDER BY
+                       ts_rank_cd(search_vector, query, 32)
+                       + word_similarity(:title, title) DESC,
+                       id
                    LIMIT :limit OFFSET :offset
                    """)
         result = session.execute(
             sql,
             {
                 "title": title,
+                "city_id": city_id,
                 "location": f"%{city}%",
                 "limit": fetch_limit,
                 "offset": offset,
@@ -61,23 +108,9 @@ def get_queried_jobs(
         )
         jobs = [Job(**dict(row._mapping)) for row in result]
 
-    elif title:
-        sql = text("""
-               SELECT * FROM job
-                WHERE (similarity(title, :title) > 0.1 OR title ILIKE :title_pattern)
-                ORDER BY similarity(title, :title) DESC
-                LIMIT :limit OFFSET :offset
-               """)
-        result = session.execute(
-            sql,
-            {
-                "title": title,
-                "limit": fetch_limit,
-                "offset": offset,
-                "title_pattern": f"%{title}%",
-            },
-        )
-        jobs = [Job(**dict(row._mapping)) for row in result]
+    elif city_id is not None:
+        query = query.where(Job.city_id == city_id)
+        jobs = session.exec(query.offset(offset).limit(fetch_limit)).all()
 
     elif city:
         query = query.where(Job.location.ilike(f"%{city}%"))
@@ -98,49 +131,24 @@ def get_queried_jobs(
     return jobs
 
 
+def get_city_id(city: str, session: Session) -> int | None:
+    """Id of the canonical city named by the search text, None when unknown"""
+    return get_city_resolver(session).resolve(city)
+
+
 def get_featured_cities(session: Session):
-    budva_jobs = session.exec(
-        select(func.count()).select_from(Job).where(Job.location.ilike("%Budva%"))
-    ).one()
-    podgorica_jobs = session.exec(
-        select(func.count()).select_from(Job).where(Job.location.ilike("%Podgorica%"))
-    ).one()
-    tivat_jobs = session.exec(
-        select(func.count()).select_from(Job).where(Job.location.ilike("%Tivat%"))
-    ).one()
-    herceg_novi_jobs = session.exec(
-        select(func.count()).select_from(Job).where(Job.location.ilike("%Herceg Novi%"))
-    ).one()
-    kotor_jobs = session.exec(
-        select(func.count()).select_from(Job).where(Job.location.ilike("%Kotor%"))
-    ).one()
+    counts = dict(
+        session.exec(
+            select(City.name, func.count(Job.id))
+            .join(Job, Job.city_id == City.id)
+            .where(City.name.in_(FEATURED_CITIES))
+            .group_by(City.name)
+        ).all()
+    )
 
     cities = [
-        {
-            "title": "Podgorica",
-            "total_jobs": podgorica_jobs,
-            "image": "images/cities/podgorica.jpg",
-        },
-        {
-            "title": "Budva",
-            "total_jobs": budva_jobs,
-            "image": "images/cities/budva.webp",
-        },
-        {
-            "title": "Herceg Novi",
-            "total_jobs": herceg_novi_jobs,
-            "image": "images/cities/herceg-novi.jpg",
-        },
-        {
-            "title": "Tivat",
-            "total_jobs": tivat_jobs,
-            "image": "images/cities/tivat.avif",
-        },
-        {
-            "title": "Kotor",
-            "total_jobs": kotor_jobs,
-            "image": "images/cities/kotor.jpg",
-        },
+        {"title": name, "total_jobs": counts.get(name, 0), "image": image}
+        for name, image in FEATURED_CITIES.items()
     ]
     return cities
 
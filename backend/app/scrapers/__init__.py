@@ -1,20 +1,20 @@
-from .berza_rada import BerzaRada
-from .prekoveze import PrekoVeze
-from .radnikme import RadnikMe
-from .zaposlime import ZaposliMe
-from .zzzcg import ZzzCg
+from importlib import import_module
 
+from .base import BaseScraper
+
+# Scraper modules are imported only when scraper is requested, so importing
+# the package doesn't pull in selenium or any scraper specific dependency
 SCRAPER_REGISTRY = {
-    "prekoveze": PrekoVeze,
-    "zaposlime": ZaposliMe,
-    "zzzcg": ZzzCg,
-    "radnikme": RadnikMe,
-    "berzarada": BerzaRada,
+    "prekoveze": "app.scrapers.prekoveze:PrekoVeze",
+    "zaposlime": "app.scrapers.zaposlime:ZaposliMe",
+    "zzzcg": "app.scrapers.zzzcg:ZzzCg",
+    "radnikme": "app.scrapers.radnikme:RadnikMe",
+    "berzarada": "app.scrapers.berza_rada:BerzaRada",
 }
 
 
-def get_scraper(scraper: str) -> PrekoVeze | ZaposliMe | ZzzCg:
-    """Funciton to initialize and return scraper class
+def get_scraper_class(scraper: str) -> type[BaseScraper]:
+    """Function to import and return scraper class
 
     Args:
         scraper(str): name of the supported scraper
@@ -22,7 +22,21 @@ def get_scraper(scraper: str) -> PrekoVeze | ZaposliMe | ZzzCg:
     Returns:
         scraper class or raise a error if source is not supported
     """
-    scraper_class = SCRAPER_REGISTRY.get(scraper)
-    if not scraper_class:
+    scraper_path = SCRAPER_REGISTRY.get(scraper)
+    if not scraper_path:
         raise ValueError(f"Uknown scraper: {scraper}")
-    return scraper_class()
+
+    module_name, class_name = scraper_path.split(":")
+    return getattr(import_module(module_name), class_name)
+
+
+def get_scraper(scraper: str) -> BaseScraper:
+    """Funciton to initialize and return scraper class
+
+    Args:
+        scraper(str): name of the supported scraper
+
+    Returns:
+        scraper class or raise a error if source is not supported
+    """
+    return get_scraper_class(scraper)()
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_ARCHIVE_DIR = os.getenv("SCRAPER_ARCHIVE_DIR", ".cache/scrapers/archive")
+# Days of fetched pages kept, older index days and pages only they referenced
+# are deleted
+SCRAPER_ARCHIVE_MAX_AGE_DAYS = int(os.getenv("SCRAPER_ARCHIVE_MAX_AGE_DAYS", "14"))
+
+LISTING = "listing"
+DETAIL = "detail"
+
+
+@dataclass
+class ArchiveEntry:
+    url: str
+    source: str
+    kind: str
+    fetched_at: str
+    sha256: str
+
+
+class PageArchive:
+    """Archive of fetched pages for re-parsing them offline.
+
+    Page bodies are stored once per content, zstd compressed, under
+    objects/ab/<sha256>.zst. Every fetch adds a line to the index of its day,
+    index/YYYY-MM-DD.jsonl, pointing the url at the body fetched then.
+    Modification time of an object is the last fetch that referenced it.
+    """
+
+    def __init__(self, directory: str = SCRAPER_ARCHIVE_DIR) -> None:
+        self.directory = Path(directory)
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        (self.directory / "index").mkdir(parents=True, exist_ok=True)
+        self._index_lock = threading.Lock()
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.directory / "objects" / sha256[:2] / f"{sha256}.zst"
+
+    def _index_path(self, day: date) -> Path:
+        return self.directory / "index" / f"{day.isoformat()}.jsonl"
+
+    def put(self, url: str, body: str, source: str, kind: str) -> ArchiveEntry:
+        data = body.encode()
+        sha256 = hashlib.sha256(data).hexdigest()
+
+        path = self._object_path(sha256)
+        try:
+            # Refetched page is referenced again, pruning must keep it
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(zstandard.ZstdCompressor().compress(data))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        fetched_at = datetime.now(timezone.utc)
+        entry = ArchiveEntry(
+            url=url,
+            source=source,
+            kind=kind,
+            fetched_at=fetched_at.isoformat(),
+            sha256=sha256,
+        )
+        # Single short append, so lines of concurrent workers don't interleave
+        line = json.dumps(asdict(entry), ensure_ascii=False) + "\n"
+        with self._index_lock:
+            with self._index_path(fetched_at.date()).open("a", encoding="utf-8") as f:
+                f.write(line)
+
+        return entry
+
+    def get(self, sha256: str) -> str:
+        with self._object_path(sha256).open("rb") as f:
+            return zstandard.ZstdDecompressor().decompress(f.read()).decode()
+
+    def entries(self, day: date, source: str | None = None) -> Iterator[ArchiveEntry]:
+        """Index entries of pages fetched on the day, in fetch order"""
+        try:
+            f = self._index_path(day).open(encoding="utf-8")
+        except FileNotFoundError:
+            return
+
+        with f:
+            for line in f:
+                try:
+                    entry = ArchiveEntry(**json.loads(line))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Invalid archive index line: {e}")
+                    continue
+                if source is None or entry.source == source:
+                    yield entry
+
+    def prune(self, max_age_days: int = SCRAPER_ARCHIVE_MAX_AGE_DAYS) -> dict:
+        """Function to delete index days older than max_age_days and pages
+        no kept day references
+
+        Args:
+            max_age_days(int): days of index kept, today included
+
+        Returns:
+            numbers of deleted index days and page objects
+        """
+        oldest_day = datetime.now(timezone.utc).date() - timedelta(days=max_age_days)
+        cutoff = datetime.combine(oldest_day, time(), timezone.utc).timestamp()
+        deleted = {"days": 0, "objects": 0}
+
+        for path in (self.directory / "index").glob("*.jsonl"):
+            try:
+                if date.fromisoformat(path.stem) < oldest_day:
+                    path.unlink()
+                    deleted["days"] += 1
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unable to prune archive index {path}: {e}")
+
+        # Objects referenced by a kept day were fetched on or after it
+        for path in (self.directory / "objects").glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted["objects"] += 1
+            except OSError as e:
+                logger.warning(f"Unable to prune archive object {path}: {e}")
+
+        return deleted
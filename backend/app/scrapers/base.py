@@ -1,14 +1,134 @@
+import hashlib
 import logging
+import math
+import os
+import random
+import re
+import threading
 import time
+import unicodedata
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import List
+from typing import Callable, Iterator, List
+from urllib.parse import urlsplit
 
-import requests
-from pydantic import BaseModel
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
+from pydantic import BaseModel, computed_field
+
+from . import parse_pool
+from .archive import DETAIL, LISTING, SCRAPER_ARCHIVE_DIR, PageArchive
+from .circuit_breaker import get_circuit_breaker
+from .http_cache import SCRAPER_CACHE_DIR, CacheEntry, HttpCache, content_hash
+from .http_client import get_http_client
+from .rate_limit import get_rate_limiter, parse_retry_after
+from .spec import ExtractionSpec
 
 logger = logging.getLogger(__name__)
 
+try:
+    import lxml  # noqa: F401
+
+    DEFAULT_HTML_PARSER = "lxml"
+except ImportError:
+    DEFAULT_HTML_PARSER = "html.parser"
+
+HTML_PARSER = os.getenv("SCRAPER_HTML_PARSER", DEFAULT_HTML_PARSER)
+
+# Base url of a stand-in portal server that fetches are sent to, used by
+# benchmarks, "http://127.0.0.1:8765" fetches https://prekoveze.me/x from
+# http://127.0.0.1:8765/prekoveze.me/x
+SCRAPER_URL_REWRITE = os.getenv("SCRAPER_URL_REWRITE", "")
+
+# Job fields covered by the content hash, a stored job is rewritten when any
+# of them changes
+CONTENT_FIELDS: tuple[str, ...] = (
+    "title",
+    "company",
+    "location",
+    "expires",
+    "description",
+)
+
+# Looks up urls of one listing page, returns url to the requested content
+# fields of the ones already stored
+KnownJobsLookup = Callable[[List[str], List[str]], dict[str, dict]]
+
+
+class AnyOf(SoupStrainer):
+    """Strainer that keeps every part of the document matched by any strainer"""
+
+    def __init__(self, *strainers: SoupStrainer) -> None:
+        super().__init__()
+        self.strainers = strainers
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return any(s.allow_tag_creation(nsprefix, name, attrs) for s in self.strainers)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return any(s.allow_string_creation(string) for s in self.strainers)
+
+
+def class_pattern(*names: str) -> re.Pattern:
+    """Pattern matching class attribute that holds any of the given classes.
+
+    Strainers see the raw class string while the page is parsed, so a plain
+    class name would only match elements that have exactly that one class.
+    """
+    alternatives = "|".join(re.escape(name) for name in names)
+    return re.compile(rf"(?:^|\s)(?:{alternatives})(?:\s|$)")
+
+
+def parse_html(html: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    """Function to parse html with the configured parser backend
+
+    Args:
+        html(str): page content
+        parse_only(SoupStrainer): keep only matching elements and their
+            children, rest of the document is skipped while parsing
+
+    Returns:
+        BeautifulSoup tree
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+# Failures worth retrying, host could answer the next attempt
+TRANSIENT_ERRORS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class FetchError(Exception):
+    """Raised when a page could not be fetched, even after retries"""
+
+
+def rewrite_url(url: str) -> str:
+    """Return url the page is fetched from, see SCRAPER_URL_REWRITE"""
+    if not SCRAPER_URL_REWRITE:
+        return url
+
+    parts = urlsplit(url)
+    rewritten = f"{SCRAPER_URL_REWRITE.rstrip('/')}/{parts.netloc}{parts.path}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _host_semaphore(url: str, limit: int) -> threading.BoundedSemaphore:
+    """Return semaphore that caps concurrent requests to the host of the url"""
+    host = urlsplit(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(limit)
+        return _host_semaphores[host]
+
 
 class Job(BaseModel):
     id: int | None = None
@@ -24,57 +144,334 @@ class Job(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @computed_field  # type: ignore[misc]
+    @property
+    def content_hash(self) -> str:
+        """Fingerprint of the fields shown to users, stored with the job so an
+        unchanged job is not written again. Whitespace differences between
+        scrapes don't change it"""
+        normalized = "\x1f".join(
+            normalize_content(getattr(self, field)) for field in CONTENT_FIELDS
+        )
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def normalize_content(value: object) -> str:
+    if value is None:
+        return ""
+    return " ".join(unicodedata.normalize("NFC", str(value)).split())
+
 
 class BaseScraper(ABC):
     BASE_URL: str
+    # Value stored in Job.source for jobs from this scraper
+    SOURCE: str
+    # Selectors of job cards, card fields and description of this source
+    SPEC: ExtractionSpec
+    # Max number of detail pages fetched at the same time from one host
+    MAX_CONCURRENCY: int = 8
+    # Set to False for sources where listing card already holds all job data
+    FETCH_DETAILS: bool = True
+    # Set to False for sources with a single listing that ignores page number,
+    # such a source is scraped from one page and never split into shards
+    PAGINATED: bool = True
+    # Starting request rate per host, limiter adapts it to how the host responds
+    REQUESTS_PER_SECOND: float = 2.0
+    # Separate connect and read timeouts in seconds, a host that doesn't
+    # accept connections is given up on sooner than one that responds slowly
+    CONNECT_TIMEOUT: float = 5.0
+    READ_TIMEOUT: float = 15.0
+    # Retries of a failed fetch, waiting up to BACKOFF_BASE * 2 ** attempt
+    MAX_RETRIES: int = 3
+    BACKOFF_BASE: float = 0.5
+    BACKOFF_MAX: float = 10.0
+    # Parts of listing and detail pages scraper reads, None parses whole page
+    LISTING_PARSE_ONLY: SoupStrainer | None = None
+    DETAIL_PARSE_ONLY: SoupStrainer | None = None
 
-    def __init__(self, delay: float = 3.0) -> None:
-        self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update(self._get_headers())
+    def __init__(self) -> None:
+        self.headers = self._get_headers()
+        self.http_cache = HttpCache() if SCRAPER_CACHE_DIR else None
+        self.archive = PageArchive() if SCRAPER_ARCHIVE_DIR else None
+        self.cache_stats: dict[str, int] = {"hits": 0, "unchanged": 0, "misses": 0}
+        self._cache_stats_lock = threading.Lock()
+        self.fetch_latencies: List[float] = []
 
     def _get_headers(self) -> dict:
         return {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
 
+    def _count_cache(self, key: str) -> None:
+        with self._cache_stats_lock:
+            self.cache_stats[key] += 1
+
+    def fetch_stats(self) -> dict:
+        """Number of requests sent and their median and p95 latency in seconds"""
+        latencies = sorted(self.fetch_latencies)
+        if not latencies:
+            return {"requests": 0, "p50_latency": None, "p95_latency": None}
+
+        def percentile(p: float) -> float:
+            return round(latencies[math.ceil(p * len(latencies)) - 1], 4)
+
+        return {
+            "requests": len(latencies),
+            "p50_latency": percentile(0.5),
+            "p95_latency": percentile(0.95),
+        }
+
     def _fetch_page(self, url: str) -> str | None:
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.warning(f"Error fetching {url}: {e}")
+        """Fetch page, retrying transient failures with exponential backoff
+
+        Args:
+            url(str): page url
+
+        Returns:
+            page html or None when host answers with a client error, raises
+            FetchError when page could not be fetched or host's circuit is open
+        """
+        cached = self.http_cache.get(url) if self.http_cache else None
+        headers = {**self.headers, **(cached.conditional_headers() if cached else {})}
+
+        host = urlsplit(url).netloc
+        limiter = get_rate_limiter(host, self.REQUESTS_PER_SECOND)
+        breaker = get_circuit_breaker(host)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            if not breaker.allow():
+                raise FetchError(f"Circuit for {host} is open, skipping {url}")
+
+            limiter.acquire()
+            started = time.monotonic()
+            retry_after = None
+
+            try:
+                response = get_http_client().get(
+                    rewrite_url(url),
+                    headers=headers,
+                    timeout=httpx.Timeout(
+                        self.READ_TIMEOUT, connect=self.CONNECT_TIMEOUT
+                    ),
+                )
+            except TRANSIENT_ERRORS as e:
+                latency = time.monotonic() - started
+                limiter.record(None, latency)
+                error = repr(e)
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                logger.warning(f"Error fetching {url}: {e}")
+                return None
+            else:
+                latency = time.monotonic() - started
+                limiter.record(
+                    response.status_code, latency, response.headers.get("Retry-After")
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    self.fetch_latencies.append(latency)
+                    breaker.record_success()
+                    return self._read_response(url, response, cached)
+
+                error = f"status {response.status_code}"
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            self.fetch_latencies.append(latency)
+            breaker.record_failure()
+
+            delay = self._backoff(attempt, retry_after)
+            if attempt == self.MAX_RETRIES or delay is None:
+                break
+            logger.info(f"Retrying {url} in {delay:.1f}s after {error}")
+            time.sleep(delay)
+
+        raise FetchError(f"Error fetching {url}: {error}")
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float | None:
+        """Seconds to wait before next attempt, None when host asks to wait
+        longer than it's worth waiting"""
+        if retry_after is not None and retry_after > self.BACKOFF_MAX:
+            return None
+
+        # Full jitter, so retries of many pages don't hit the host at once
+        delay = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2**attempt))
+        return max(delay, retry_after or 0.0)
+
+    def _read_response(
+        self, url: str, response: httpx.Response, cached: CacheEntry | None
+    ) -> str | None:
+        if response.status_code == 304 and cached:
+            self._count_cache("hits")
+            self.http_cache.touch(url)
+            return cached.body
+
+        if response.is_error:
+            logger.warning(f"Error fetching {url}: status {response.status_code}")
             return None
 
+        html = response.text
+        if not self.http_cache:
+            return html
+
+        # Server without validators still lets us recognise unchanged page by hash
+        if cached and cached.content_hash == content_hash(html):
+            self._count_cache("unchanged")
+            self.http_cache.touch(url)
+        else:
+            self._count_cache("misses")
+            self.http_cache.set(url, html, response.headers)
+
+        return html
+
+    def _archive_page(self, url: str, html: str, kind: str) -> None:
+        """Keep fetched page for re-parsing, scraping goes on if it fails"""
+        if not self.archive:
+            return
+        try:
+            self.archive.put(url, html, source=self.SOURCE, kind=kind)
+        except OSError as e:
+            logger.warning(f"Error archiving {url}: {e}")
+
+    def _fetch_listing(self, url: str) -> str | None:
+        return self._fetch_page(url)
+
+    def _fetch_detail_page(self, url: str) -> str | None:
+        with _host_semaphore(url, self.MAX_CONCURRENCY):
+            return self._fetch_page(url)
+
     @abstractmethod
     def _build_url(self, page: int) -> str:
         """Need to build and return BASE_URL + additional params"""
         pass
 
-    @abstractmethod
-    def _parse_listing(self, html: str) -> List[Job]:
-        pass
+    def _parse_listing(self, html: str) -> List[dict]:
+        """Parsing listing page into job cards, every card must contain url"""
+        cards: List = []
+        soup = parse_html(html, self.LISTING_PARSE_ONLY)
+
+        for card in self.SPEC.select_cards(soup):
+            try:
+                cards.append(self._parse_card(card))
+            except Exception as e:
+                logger.warning(f"Error parsing job for {self.__class__.__name__}: {e}")
+                continue
+
+        return cards
+
+    def _parse_card(self, card) -> dict:
+        """Read card fields, scrapers override it to convert field values"""
+        return self.SPEC.extract_card(card)
 
     @abstractmethod
-    def _parse_job_details(self, card) -> Job:
-        """Parsing job details"""
+    def _parse_job_details(self, card: dict, detail_html: str | None) -> Job | None:
+        """Parsing job details from listing card and fetched detail page"""
         pass
 
-    def scrape(self, max_pages: int = 1) -> List[Job] | None:
-        jobs = []
+    def _parse_listing_page(self, html: str) -> List[dict]:
+        """Parse listing in the parse pool when enabled, in this process otherwise"""
+        try:
+            return parse_pool.run(parse_pool.parse_listing, type(self), html)
+        except parse_pool.ParsePoolUnavailable:
+            return self._parse_listing(html)
 
-        for page in range(max_pages + 1):
-            logger.info(f"Scraping jobs for {self}")
-            url = self._build_url(page)
-            html = self._fetch_page(url)
+    def _parse_job(self, card: dict, detail_html: str | None) -> Job | None:
+        """Parse job in the parse pool when enabled, in this process otherwise"""
+        try:
+            job = parse_pool.run(
+                parse_pool.parse_job_details, type(self), card, detail_html
+            )
+        except parse_pool.ParsePoolUnavailable:
+            return self._parse_job_details(card, detail_html)
 
-            if not html:
-                break
+        return Job(**job) if job else None
 
-            page_jobs = self._parse_listing(html)
-            jobs.extend(page_jobs)
+    def _build_job(self, card: dict) -> Job | None:
+        """Fetch detail page for a card and hand it to the parser"""
+        try:
+            detail_html = None
+            if self.FETCH_DETAILS:
+                detail_html = self._fetch_detail_page(card["url"])
+                if detail_html is None:
+                    return None
+                self._archive_page(card["url"], detail_html, DETAIL)
+
+            return self._parse_job(card, detail_html)
+        except Exception as e:
+            logger.warning(f"Error parsing job for {self.__class__.__name__}: {e}")
+            return None
+
+    def _build_jobs(self, cards: List[dict], executor: ThreadPoolExecutor) -> List[Job]:
+        return [job for job in executor.map(self._build_job, cards) if job]
 
-            time.sleep(self.delay)
+    def last_page_number(self) -> int | None:
+        """Number of the last listing page, None when source can't tell"""
+        return None
 
+    @staticmethod
+    def _is_known(card: dict, known_jobs: dict[str, dict]) -> bool:
+        """Card is known when url is stored and none of the content fields
+        the card holds differ from the stored job"""
+        stored = known_jobs.get(card["url"])
+        if stored is None:
+            return False
+        # Compared the way the content hash sees them, so whitespace changes
+        # that would not be written don't make the card new on every run
+        return all(
+            normalize_content(card[field]) == normalize_content(stored[field])
+            for field in CONTENT_FIELDS
+            if field in card
+        )
+
+    def stream(
+        self,
+        max_pages: int = 1,
+        known_jobs: KnownJobsLookup | None = None,
+        start_page: int = 0,
+    ) -> Iterator[List[Job]]:
+        """Scrape listing pages and yield jobs built from each page's cards
+
+        Args:
+            max_pages(int): number of the last listing page to scrape
+            known_jobs(KnownJobsLookup): looks up stored jobs among the cards
+                of each page, their detail pages are skipped and scraping
+                stops at the first listing page that holds only known jobs
+            start_page(int): number of the first listing page to scrape
+
+        Yields:
+            list of new or changed jobs from one listing page
+        """
+        try:
+            last_page = max_pages if self.PAGINATED else start_page
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENCY) as executor:
+                for page in range(start_page, last_page + 1):
+                    logger.info(f"Scraping jobs for {self}")
+                    url = self._build_url(page)
+                    html = self._fetch_listing(url)
+
+                    if not html:
+                        break
+                    self._archive_page(url, html, LISTING)
+
+                    cards = self._parse_listing_page(html)
+                    known = {}
+                    if known_jobs:
+                        fields = [
+                            f for f in CONTENT_FIELDS if any(f in c for c in cards)
+                        ]
+                        known = known_jobs([c["url"] for c in cards], fields)
+                    new_cards = [c for c in cards if not self._is_known(c, known)]
+
+                    if cards and not new_cards:
+                        logger.info(f"Page {page} holds only known jobs, stopping")
+                        break
+
+                    yield self._build_jobs(new_cards, executor)
+        finally:
+            logger.info(f"HTTP cache for {self.__class__.__name__}: {self.cache_stats}")
+
+    def scrape(
+        self, max_pages: int = 1, known_jobs: KnownJobsLookup | None = None
+    ) -> List[Job] | None:
+        """Scrape all listing pages at once, see `stream` for arguments"""
+        jobs = []
+        for page_jobs in self.stream(max_pages=max_pages, known_jobs=known_jobs):
+            jobs.extend(page_jobs)
         return jobs
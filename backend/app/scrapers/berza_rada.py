@@ -1,66 +1,43 @@
 import logging
-from typing import List
 
-from app.scrapers.base import BaseScraper, Job
+from app.scrapers.base import BaseScraper, Job, class_pattern
+from app.scrapers.spec import ExtractionSpec, FieldSpec
 from app.scrapers.utils import convert_date
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 logger = logging.getLogger(__name__)
 
 
 class BerzaRada(BaseScraper):
     BASE_URL = "https://www.berzarada.me"
+    SOURCE = "berzarada.me"
+    FETCH_DETAILS = False
+    LISTING_PARSE_ONLY = SoupStrainer("a", class_=class_pattern("job"))
+
+    SPEC = ExtractionSpec(
+        card="a.job",
+        fields={
+            "title": FieldSpec("h2", required=True),
+            "company": FieldSpec("div.job-company", following="p", required=True),
+            "url": FieldSpec(attr="href"),
+            "location": FieldSpec("div.location"),
+            "expires": FieldSpec(
+                'div[class="job-title small-heading"]', following="span"
+            ),
+            "img": FieldSpec("img", attr="src", required=True),
+            "description": FieldSpec("div.job-content", following="p", required=True),
+        },
+    )
 
     def _build_url(self, page: int) -> str:
         params: str = f"/poslovi/?p={page}"
         return self.BASE_URL + params
 
-    def _parse_listing(self, html: str) -> List[Job]:
-        jobs: List = []
-        soup = BeautifulSoup(html, "html.parser")
-        jobs_cards = soup.find_all("a", class_="job")
+    def _parse_card(self, card) -> dict:
+        fields = self.SPEC.extract_card(card)
+        fields["expires"] = convert_date(fields["expires"])
+        return fields
 
-        for card in jobs_cards:
-            try:
-                job = self._parse_job_details(card)
-                jobs.append(job)
-            except Exception as e:
-                logger.warning(f"Error parsing job for berzarada: {e}")
-                continue
-
-        return jobs
-
-    def _parse_job_details(self, card) -> Job:
-        title_elem = card.find("h2")
-        title = title_elem.get_text(strip=True)
-
-        company_elem = card.find("div", class_="job-company").find_next("p")
-        company = company_elem.get_text(strip=True)
-
-        description_elem = card.find("div", class_="job-content").find_next("p")
-        description = description_elem.get_text(strip=True)
-
-        url = card["href"]
-
-        img = card.find("img")["src"]
-
-        location_elem = card.find("div", class_="location")
-        location = location_elem.get_text(strip=True) if location_elem else "N/A"
-
-        expires_elem = card.find("div", class_="job-title small-heading").find_next(
-            "span"
-        )
-        expires = expires_elem.get_text(strip=True) if expires_elem else "N/A"
-        expires_date_object = convert_date(expires)
-
-        return Job(
-            title=title,
-            company=company,
-            url=url,
-            location=location,
-            date_posted=None,
-            expires=expires_date_object,
-            source="berzarada.me",
-            img=img,
-            description=description,
-        )
+    def _parse_job_details(self, card: dict, detail_html: str | None) -> Job:
+        # Listing card holds all job data, there is no detail page to parse
+        return Job(**card, date_posted=None, source=self.SOURCE)
@@ -0,0 +1,211 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+# Number of Chrome instances kept running in a worker process
+SCRAPER_BROWSER_POOL_SIZE = int(os.getenv("SCRAPER_BROWSER_POOL_SIZE", "1"))
+
+# Browser is restarted after this many pages, so leaked memory is given back
+MAX_PAGES_PER_BROWSER = 50
+
+# Resources scrapers don't read, Chrome doesn't download them
+BLOCKED_URLS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.css",
+]
+
+# Runs before page scripts, hides webdriver and counts fetch and XHR requests
+# in flight, so the scraper can wait for the page to go quiet
+PAGE_SETUP_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+
+window.__pendingRequests = 0;
+const originalFetch = window.fetch;
+window.fetch = function (...args) {
+    window.__pendingRequests++;
+    return originalFetch.apply(this, args).finally(() => window.__pendingRequests--);
+};
+const originalSend = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.send = function (...args) {
+    window.__pendingRequests++;
+    this.addEventListener('loadend', () => window.__pendingRequests--, {once: true});
+    return originalSend.apply(this, args);
+};
+"""
+
+NETWORK_IDLE_TIMEOUT: float = 10.0
+NETWORK_IDLE_QUIET: float = 0.5
+
+
+def create_driver() -> webdriver.Chrome:
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+
+    # Set a real user agent
+    options.add_argument(
+        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    driver = webdriver.Chrome(options=options)
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument", {"source": PAGE_SETUP_SCRIPT}
+    )
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    return driver
+
+
+def wait_for_network_idle(
+    driver: webdriver.Chrome,
+    timeout: float = NETWORK_IDLE_TIMEOUT,
+    quiet: float = NETWORK_IDLE_QUIET,
+) -> bool:
+    """Function to wait until page has no requests in flight for a while
+
+    Args:
+        driver(webdriver.Chrome): driver with the page loaded
+        timeout(float): max seconds to wait
+        quiet(float): seconds without requests that count as idle
+
+    Returns:
+        False when page was still loading after timeout
+    """
+    idle_since: float | None = None
+
+    def is_idle(d) -> bool:
+        nonlocal idle_since
+        if d.execute_script("return window.__pendingRequests || 0"):
+            idle_since = None
+            return False
+
+        now = time.monotonic()
+        if idle_since is None:
+            idle_since = now
+        return now - idle_since >= quiet
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(is_idle)
+        return True
+    except TimeoutException:
+        return False
+
+
+class BrowserPool:
+    """Chrome instances kept running between scrapes of a worker process.
+
+    Starting Chrome takes seconds, so a browser is taken from the pool for
+    one page and given back. A browser that failed is closed, not reused.
+    """
+
+    def __init__(self, size: int = SCRAPER_BROWSER_POOL_SIZE) -> None:
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._uses: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._drivers: list[webdriver.Chrome] = []
+
+    @contextmanager
+    def driver(self) -> Iterator[webdriver.Chrome]:
+        with self._slots:
+            driver = self._take()
+            try:
+                yield driver
+            except BaseException:
+                self._discard(driver)
+                raise
+            self._give_back(driver)
+
+    def _take(self) -> webdriver.Chrome:
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+            # Chrome could have crashed while it waited in the pool
+            try:
+                driver.current_url
+                return driver
+            except WebDriverException:
+                self._discard(driver)
+
+        logger.info("Starting Chrome for browser pool")
+        driver = create_driver()
+        with self._lock:
+            self._drivers.append(driver)
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _give_back(self, driver: webdriver.Chrome) -> None:
+        with self._lock:
+            self._uses[id(driver)] += 1
+            worn_out = self._uses[id(driver)] >= MAX_PAGES_PER_BROWSER
+
+        if worn_out:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logger.warning(f"Error closing Chrome: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._discard(driver)
+
+
+_pool: BrowserPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return browser pool of the current process, started on first use"""
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        # Browsers of the parent are not usable in a forked worker process
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = BrowserPool()
+            _pool_pid = os.getpid()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,76 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Stops requests to a host after repeated failures.
+
+    After FAILURE_THRESHOLD failures in a row the circuit opens and requests
+    fail at once without reaching the host. After RESET_TIMEOUT seconds one
+    request is let through, success closes the circuit and failure opens it
+    again.
+    """
+
+    FAILURE_THRESHOLD: int = 5
+    RESET_TIMEOUT: float = 60.0
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a request to the host can be sent now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+
+            if self.probing:
+                return False
+            if time.monotonic() - self.opened_at < self.RESET_TIMEOUT:
+                return False
+
+            # Only one request tests whether the host recovered
+            self.probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit for {self.host} closed")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.probing or (
+                self.opened_at is None and self.failures >= self.FAILURE_THRESHOLD
+            ):
+                logger.warning(
+                    f"Circuit for {self.host} opened after {self.failures} failures"
+                )
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Return circuit breaker shared by all fetches to the host in this process"""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_CACHE_DIR = os.getenv("SCRAPER_CACHE_DIR", ".cache/scrapers/http")
+# Entries not used for this many days are deleted, pages of jobs that expired
+# are never fetched again
+SCRAPER_CACHE_MAX_AGE_DAYS = int(os.getenv("SCRAPER_CACHE_MAX_AGE_DAYS", "30"))
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str
+    content_hash: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict:
+        """Validators to send so unchanged page comes back as 304"""
+        headers: dict = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """On-disk cache of fetched pages, one JSON file per url. Modification
+    time of the file is the last time its entry was used"""
+
+    def __init__(self, directory: str = SCRAPER_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, url: str) -> CacheEntry | None:
+        path = self._path(url)
+        try:
+            with path.open(encoding="utf-8") as f:
+                return CacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Invalid cache entry for {url}: {e}")
+            return None
+
+    def touch(self, url: str) -> None:
+        """Mark entry of the url as used, so pruning keeps it"""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def set(self, url: str, body: str, headers) -> CacheEntry:
+        entry = CacheEntry(
+            url=url,
+            body=body,
+            content_hash=content_hash(body),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+        path = self._path(url)
+        path.parent.mkdir(exist_ok=True)
+
+        # Write to temp file first so concurrent readers never see partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Unable to write cache entry for {url}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+        return entry
+
+    def prune(self, max_age_days: int = SCRAPER_CACHE_MAX_AGE_DAYS) -> int:
+        """Function to delete entries not used for max_age_days
+
+        Args:
+            max_age_days(int): days since the last use of an entry
+
+        Returns:
+            number of deleted entries
+        """
+        cutoff = time.time() - max_age_days * 24 * 60 * 60
+        deleted = 0
+
+        for path in self.directory.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except OSError as e:
+                logger.warning(f"Unable to prune cache entry {path}: {e}")
+
+        return deleted
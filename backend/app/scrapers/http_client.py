@@ -0,0 +1,47 @@
+import atexit
+import logging
+import os
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Open connections of the shared client. Requests to one host are capped by
+# scraper's MAX_CONCURRENCY, over HTTP/2 they share a single connection
+HTTP_MAX_CONNECTIONS: int = 64
+HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 32
+# Seconds an idle connection is kept open, pages of one run come in bursts
+HTTP_KEEPALIVE_EXPIRY: float = 60.0
+
+_client: httpx.Client | None = None
+_client_pid: int | None = None
+_client_lock = threading.Lock()
+
+
+def create_http_client() -> httpx.Client:
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Return HTTP client shared by all scrapers of the current process"""
+    global _client, _client_pid
+
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+
+    with _client_lock:
+        # Connections of the parent can't be used by a forked worker process
+        if _client is None or _client_pid != os.getpid():
+            _client = create_http_client()
+            _client_pid = os.getpid()
+            atexit.register(_client.close)
+        return _client
@@ -0,0 +1,114 @@
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Callable, List
+
+import billiard
+from billiard.exceptions import WorkerLostError
+from billiard.pool import Pool
+
+logger = logging.getLogger(__name__)
+
+# Number of processes parsing scraped pages, 0 parses them in the scraping
+# process itself
+SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", "0"))
+
+
+class ParsePoolUnavailable(Exception):
+    """Raised when pages have to be parsed in the calling process"""
+
+
+_pool: Pool | None = None
+_pool_pid: int | None = None
+_pool_disabled: bool = False
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Pool | None:
+    """Return process pool shared by all scrapers, None when it is disabled
+
+    Pool is billiard's, the multiprocessing fork celery uses. Unlike the
+    standard library pools it starts workers from a daemonic process, which
+    every child of the prefork celery worker is.
+    """
+    global _pool, _pool_pid, _pool_disabled
+
+    if SCRAPER_PARSE_WORKERS <= 0:
+        return None
+
+    with _pool_lock:
+        # Pool copied into a forked process (celery worker child) can't reach
+        # its workers, the forked process starts its own
+        if _pool is not None and _pool_pid != os.getpid():
+            _pool = None
+
+        if _pool is None and not _pool_disabled:
+            # Pages are fetched from many threads, forking any of them could
+            # copy a lock held by another thread, so workers are spawned
+            try:
+                _pool = billiard.get_context("spawn").Pool(SCRAPER_PARSE_WORKERS)
+            except Exception as e:
+                logger.warning(f"Parse pool unavailable, parsing in process: {e!r}")
+                _pool_disabled = True
+                return None
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _disable_parse_pool(error: Exception) -> None:
+    global _pool, _pool_disabled
+
+    with _pool_lock:
+        if _pool_disabled:
+            return
+        logger.warning(f"Parse pool unavailable, parsing in process: {error!r}")
+        _pool_disabled = True
+        if _pool is not None:
+            _pool.terminate()
+            _pool = None
+
+
+def run(fn: Callable, *args):
+    """Function to run parser in the parse pool and wait for its result
+
+    Args:
+        fn(Callable): module level function, so it can be sent to a worker
+        args: picklable arguments of the function
+
+    Returns:
+        result of the function, raises ParsePoolUnavailable when pool is
+        disabled, can't start workers or loses one
+    """
+    pool = get_parse_pool()
+    if pool is None:
+        raise ParsePoolUnavailable
+
+    try:
+        result = pool.apply_async(fn, args)
+    except Exception as e:
+        _disable_parse_pool(e)
+        raise ParsePoolUnavailable from e
+
+    try:
+        return result.get()
+    except WorkerLostError as e:
+        _disable_parse_pool(e)
+        raise ParsePoolUnavailable from e
+
+
+@lru_cache(maxsize=None)
+def _get_scraper(scraper_class: type):
+    # One instance per worker process, parsers don't keep state between pages
+    return scraper_class()
+
+
+def parse_listing(scraper_class: type, html: str) -> List[dict]:
+    return _get_scraper(scraper_class)._parse_listing(html)
+
+
+def parse_job_details(
+    scraper_class: type, card: dict, detail_html: str | None
+) -> dict | None:
+    job = _get_scraper(scraper_class)._parse_job_details(card, detail_html)
+    return job.model_dump() if job else None
@@ -1,89 +1,57 @@
 import logging
-from typing import List
 
 from app.scrapers.utils import convert_date
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .base import BaseScraper, Job
+from .base import BaseScraper, Job, class_pattern, parse_html
+from .spec import DescriptionSpec, ExtractionSpec, FieldSpec
 
 logger = logging.getLogger(__name__)
 
 
 class PrekoVeze(BaseScraper):
     BASE_URL = "https://prekoveze.me"
+    SOURCE = "prekoveze.me"
+    LISTING_PARSE_ONLY = SoupStrainer(
+        "section", class_="job featured featured-primary mb-md"
+    )
+    DETAIL_PARSE_ONLY = SoupStrainer("div", id="job_view_text")
+    PAGINATION_PARSE_ONLY = SoupStrainer("a", class_=class_pattern("page-link"))
+
+    SPEC = ExtractionSpec(
+        card="section.job.featured.featured-primary.mb-md",
+        fields={
+            "title": FieldSpec("a"),
+            "url": FieldSpec("a", attr="href", required=True),
+            "img": FieldSpec("img.img-fluid", attr="src", required=True),
+            "location": FieldSpec("p", first_text=True),
+            "company": FieldSpec("p strong"),
+            "expires": FieldSpec("p span.text-muted"),
+        },
+        description=DescriptionSpec(
+            containers=("div#job_view_text",), tags=("span", "strong")
+        ),
+    )
 
     def _build_url(self, page: int) -> str:
         params: str = f"/oglasi-za-posao?page={page}"
         return self.BASE_URL + params
 
-    def _parse_listing(self, html: str) -> List[Job]:
-        jobs: List = []
-        soup = BeautifulSoup(html, "html.parser")
-        job_cards = soup.find_all(
-            "section", class_="job featured featured-primary mb-md"
-        )
-
-        for card in job_cards:
-            try:
-                job = self._parse_job_details(card=card)
-                jobs.append(job)
-
-            except Exception as e:
-                logger.warning(f"Error parsing job for prekoveze: {e}")
-                continue
-
-        return jobs
-
-    def _parse_job_details(self, card) -> Job:
-        title_elem = card.find("a")
-        title = title_elem.get_text(strip=True) if title_elem else "N/A"
-
-        url_elem = card.find("a")["href"]
-        url = self.BASE_URL + url_elem if url_elem else self.BASE_URL
-
-        img = card.find("img", class_="img-fluid")["src"]
-
-        items = card.find("p")
-        location = items.contents[0].strip() if items else "N/A"
-        company = items.find("strong").get_text(strip=True) if items else "N/A"
-        expires = (
-            items.find("span", class_="text-muted").get_text(strip=True)
-            if items
-            else "N/A"
-        )
-        expires_str = expires.replace("Važi do: ", "")
-        expires_date_object = convert_date(expires_str, source="prekoveze")
-
-        detail_html = self.session.get(url, timeout=10).text
-        detail_soup = BeautifulSoup(detail_html, "html.parser")
-
-        if description_div := detail_soup.find("div", id="job_view_text"):
-            text_parts: list = []
-
-            #if img_url := description_div.find("img"):
-            #    if img_text := extract_image_text(img_url["src"]):
-            #        print(img_text, "image text")
+    def _parse_card(self, card) -> dict:
+        fields = self.SPEC.extract_card(card)
+        fields["url"] = self.BASE_URL + fields["url"]
+        expires_str = fields["expires"].replace("Važi do: ", "")
+        fields["expires"] = convert_date(expires_str, source="prekoveze")
+        return fields
 
-            for span in description_div.find_all("span"):
-                if text := span.get_text(strip=True):
-                    text_parts.append(text)
-
-            for strong in description_div.find_all("strong"):
-                if text := strong.get_text(strip=True):
-                    text_parts.append(text)
-
-            description: str = " ".join(text_parts)
+    def _parse_job_details(self, card: dict, detail_html: str | None) -> Job:
+        detail_soup = parse_html(detail_html, self.DETAIL_PARSE_ONLY)
 
         return Job(
-            title=title,
-            company=company,
-            url=url,
-            location=location,
+            **card,
             date_posted=None,
-            expires=expires_date_object,
-            source="prekoveze.me",
-            img=img,
-            description=description,
+            source=self.SOURCE,
+            description=self.SPEC.extract_description(detail_soup),
         )
 
     def last_page_number(self) -> int | None:
@@ -92,14 +60,10 @@ class PrekoVeze(BaseScraper):
         if not html:
             return None
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = parse_html(html, self.PAGINATION_PARSE_ONLY)
         pagination_items = soup.find_all("a", class_="page-link")
         last_page_str = (
             pagination_items[-2].get_text(strip=True) if pagination_items else None
         )
         if last_page_str:
             return int(last_page_str)
-
-
-_prekoveze = PrekoVeze()
-last_page_number = _prekoveze.last_page_number()
@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Function that converts Retry-After header to number of seconds
+
+    Args:
+        value(str): header value, either delay in seconds or HTTP date
+
+    Returns:
+        number of seconds to wait or None if header is missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket for one host that adapts its rate to how the host responds.
+
+    Rate grows additively while responses are fast and successful, and is cut
+    multiplicatively on 429/5xx, connection errors or rising latency.
+    Retry-After blocks the bucket until the host allows requests again.
+    """
+
+    INCREASE_STEP: float = 0.5
+    DECREASE_FACTOR: float = 0.5
+    SLOW_DECREASE_FACTOR: float = 0.8
+    # Latency above baseline * SLOW_LATENCY_RATIO counts as host slowing down,
+    # if it is also at least SLOW_LATENCY_MARGIN seconds above the baseline
+    SLOW_LATENCY_RATIO: float = 2.0
+    SLOW_LATENCY_MARGIN: float = 0.2
+    LATENCY_ALPHA: float = 0.2
+
+    def __init__(
+        self, rate: float = 2.0, min_rate: float = 0.2, max_rate: float = 20.0
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.latency: float | None = None
+        self.baseline_latency: float | None = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        capacity = max(1.0, self.rate)
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """Block until the host can be requested again"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def record(
+        self, status: int | None, latency: float, retry_after: str | None = None
+    ) -> None:
+        """Adapt the rate to the outcome of a request
+
+        Args:
+            status(int): response status code, None if request failed
+            latency(float): request duration in seconds
+            retry_after(str): Retry-After header of the response
+        """
+        with self._lock:
+            if status is None or status == 429 or status >= 500:
+                self.rate = max(self.min_rate, self.rate * self.DECREASE_FACTOR)
+                if delay := parse_retry_after(retry_after):
+                    self.blocked_until = max(
+                        self.blocked_until, time.monotonic() + delay
+                    )
+                logger.info(f"Backing off to {self.rate:.2f} req/s (status {status})")
+                return
+
+            self._update_latency(latency)
+
+            if self._is_slowing_down():
+                self.rate = max(self.min_rate, self.rate * self.SLOW_DECREASE_FACTOR)
+            elif status < 400:
+                self.rate = min(self.max_rate, self.rate + self.INCREASE_STEP)
+
+    def _is_slowing_down(self) -> bool:
+        return (
+            self.latency > self.baseline_latency * self.SLOW_LATENCY_RATIO
+            and self.latency - self.baseline_latency > self.SLOW_LATENCY_MARGIN
+        )
+
+    def _update_latency(self, latency: float) -> None:
+        if self.latency is None or self.baseline_latency is None:
+            self.latency = self.baseline_latency = latency
+            return
+
+        self.latency += self.LATENCY_ALPHA * (latency - self.latency)
+        # Baseline follows fast responses at once and slow ones only gradually
+        if latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += 0.01 * (latency - self.baseline_latency)
+
+
+_limiters: dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host: str, rate: float = 2.0) -> AdaptiveRateLimiter:
+    """Return limiter shared by all fetches to the host in this process"""
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = AdaptiveRateLimiter(rate=rate)
+        return _limiters[host]
@@ -0,0 +1,110 @@
+"""Re-parse archived pages of a day's crawl with the current parsers.
+
+Nothing is fetched, listing and detail pages are read from the page archive
+(SCRAPER_ARCHIVE_DIR). Run from the backend directory:
+
+    python -m app.scrapers.reparse --date 2026-10-17 --source prekoveze --save
+"""
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import List
+
+from app.scrapers import SCRAPER_REGISTRY, get_scraper
+from app.scrapers.archive import DETAIL, LISTING, SCRAPER_ARCHIVE_DIR, PageArchive
+from app.scrapers.base import BaseScraper, Job
+
+logger = logging.getLogger(__name__)
+
+
+def reparse_source(scraper: BaseScraper, archive: PageArchive, day: date) -> List[Job]:
+    """Function to build jobs from archived pages of one source
+
+    Args:
+        scraper(BaseScraper): scraper whose parsers are used
+        archive(PageArchive): archive holding the pages
+        day(date): day the pages were fetched on
+
+    Returns:
+        jobs found on the day's listing pages, a job whose detail page was
+        not fetched that day (already known job) is left out
+    """
+    entries = list(archive.entries(day, source=scraper.SOURCE))
+    # Page fetched more than once a day is read as it was fetched last
+    detail_pages = {e.url: e.sha256 for e in entries if e.kind == DETAIL}
+    listing_pages = list(dict.fromkeys(e.sha256 for e in entries if e.kind == LISTING))
+
+    def build_job(card: dict) -> Job | None:
+        detail_html = None
+        if scraper.FETCH_DETAILS:
+            sha256 = detail_pages.get(card["url"])
+            if sha256 is None:
+                return None
+            detail_html = archive.get(sha256)
+
+        try:
+            return scraper._parse_job(card, detail_html)
+        except Exception as e:
+            logger.warning(f"Error parsing job {card['url']}: {e}")
+            return None
+
+    jobs: List[Job] = []
+    seen_urls: set = set()
+
+    with ThreadPoolExecutor(max_workers=scraper.MAX_CONCURRENCY) as executor:
+        for sha256 in listing_pages:
+            cards = scraper._parse_listing_page(archive.get(sha256))
+            cards = [c for c in cards if c["url"] not in seen_urls]
+            seen_urls.update(c["url"] for c in cards)
+            jobs.extend(job for job in executor.map(build_job, cards) if job)
+
+    return jobs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=datetime.now(timezone.utc).date(),
+        help="UTC day of the crawl, today by default",
+    )
+    parser.add_argument(
+        "--source", nargs="*", choices=list(SCRAPER_REGISTRY), default=None
+    )
+    parser.add_argument("--archive-dir", default=SCRAPER_ARCHIVE_DIR)
+    parser.add_argument(
+        "--save", action="store_true", help="save parsed jobs to the database"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    archive = PageArchive(args.archive_dir)
+
+    for source in args.source or list(SCRAPER_REGISTRY):
+        started = time.perf_counter()
+        scraper = get_scraper(scraper=source)
+        jobs = reparse_source(scraper, archive, args.date)
+        seconds = time.perf_counter() - started
+        print(f"{source}: {len(jobs)} jobs parsed in {seconds:.2f} s")
+
+        if args.save and jobs:
+            # Imported here, parsing alone needs no database or celery settings
+            from app.db import SessionLocal
+            from app.tasks import SAVE_BATCH_SIZE, persist_jobs
+
+            session = SessionLocal()
+            changed_ids: List[int] = []
+            try:
+                for i in range(0, len(jobs), SAVE_BATCH_SIZE):
+                    persist_jobs(jobs[i : i + SAVE_BATCH_SIZE], session, changed_ids)
+            finally:
+                session.close()
+            print(f"{source}: {len(changed_ids)} jobs saved or updated")
+
+
+if __name__ == "__main__":
+    main()
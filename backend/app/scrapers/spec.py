@@ -0,0 +1,181 @@
+from dataclasses import dataclass, field
+from typing import List
+
+import soupsieve as sv
+from bs4 import Tag
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Where to find one job field inside a listing card or a detail page
+
+    Args:
+        selector(str): CSS selector, None reads the card element itself
+        following(str): CSS selector of the element read, searched from the
+            element matched by selector onward through the rest of the
+            document like find_next, so it may be a descendant, a later
+            sibling or an element outside the card. The selector element
+            must exist, a missing one always raises
+        attr(str): attribute to read, element text is read when None
+        index(int): which of the matched elements to read
+        first_text(bool): read only the first text node of the element
+        required(bool): raise instead of returning default when missing
+        default(str): value used when element is missing
+    """
+
+    selector: str | None = None
+    following: str | None = None
+    attr: str | None = None
+    index: int = 0
+    first_text: bool = False
+    required: bool = False
+    default: str | None = "N/A"
+
+    def read(self, element: Tag | None, name: str) -> str | None:
+        if element is None:
+            if self.required:
+                raise ValueError(f"Missing {name}: {self.describe()}")
+            return self.default
+
+        if self.attr:
+            return element[self.attr]
+        if self.first_text:
+            return element.contents[0].strip()
+        return element.get_text(strip=True)
+
+    def describe(self) -> str:
+        if self.following:
+            return f"{self.following} after {self.selector}"
+        return str(self.selector)
+
+
+@dataclass(frozen=True)
+class DescriptionSpec:
+    """Which blocks of a page make up the job description
+
+    Args:
+        containers(tuple): CSS selectors of the blocks, read in this order
+        tags(tuple): text carrying tags collected from the blocks, whole block
+            text is read when empty
+    """
+
+    containers: tuple[str, ...]
+    tags: tuple[str, ...] = ()
+
+
+@dataclass
+class ExtractionSpec:
+    """Declarative description of how jobs are read from a source's pages.
+
+    Selectors are compiled once when the spec is created, so the spec is
+    defined as a scraper class attribute and shared by all its instances.
+    """
+
+    card: str
+    fields: dict[str, FieldSpec]
+    detail_fields: dict[str, FieldSpec] = field(default_factory=dict)
+    description: DescriptionSpec | None = None
+
+    def __post_init__(self) -> None:
+        self._card = sv.compile(self.card)
+        self._fields = self._compile(self.fields)
+        self._detail_fields = self._compile(self.detail_fields)
+        self._containers = [
+            sv.compile(selector)
+            for selector in (self.description.containers if self.description else ())
+        ]
+
+    @staticmethod
+    def _compile(fields: dict[str, FieldSpec]) -> list:
+        return [
+            (
+                name,
+                spec,
+                sv.compile(spec.selector) if spec.selector else None,
+                sv.compile(spec.following) if spec.following else None,
+            )
+            for name, spec in fields.items()
+        ]
+
+    def select_cards(self, soup) -> List[Tag]:
+        return self._card.select(soup)
+
+    def extract_card(self, card: Tag) -> dict:
+        """Read all card fields in a single walk over the card's elements"""
+        return self._extract(card, self._fields)
+
+    def extract_detail(self, soup) -> dict:
+        return self._extract(soup, self._detail_fields)
+
+    def _extract(self, root, fields: list) -> dict:
+        matches: dict[str, list] = {name: [] for name, *_ in fields}
+        pending = [
+            (name, spec, pattern) for name, spec, pattern, _ in fields if pattern
+        ]
+
+        for element in root.descendants:
+            if not pending:
+                break
+            if not isinstance(element, Tag):
+                continue
+
+            for item in list(pending):
+                name, spec, pattern = item
+                if pattern.match(element):
+                    matches[name].append(element)
+                    if len(matches[name]) > spec.index:
+                        pending.remove(item)
+
+        values: dict = {}
+        for name, spec, pattern, following in fields:
+            if pattern is None:
+                values[name] = spec.read(root, name)
+                continue
+
+            found = matches[name]
+            element = found[spec.index] if len(found) > spec.index else None
+            if following is not None:
+                if element is None:
+                    raise ValueError(f"Missing {name}: {spec.selector}")
+                element = self._find_next(element, following)
+            values[name] = spec.read(element, name)
+
+        return values
+
+    @staticmethod
+    def _find_next(element: Tag, pattern) -> Tag | None:
+        """First element after element in document order matching pattern"""
+        for candidate in element.next_elements:
+            if isinstance(candidate, Tag) and pattern.match(candidate):
+                return candidate
+        return None
+
+    def extract_description(self, soup) -> str | None:
+        """Join description text, None when page has no description block"""
+        if not self.description:
+            return None
+
+        blocks = [block for c in self._containers if (block := c.select_one(soup))]
+        if not blocks:
+            return None
+
+        text_parts: list = []
+        for block in blocks:
+            if self.description.tags:
+                self._collect_text(block, set(self.description.tags), text_parts)
+            elif text := block.get_text(strip=True):
+                text_parts.append(text)
+
+        return " ".join(text_parts)
+
+    def _collect_text(self, element: Tag, tags: set, text_parts: list) -> None:
+        # Text of a matched tag is taken whole, so tags nested inside it (a
+        # strong inside a span) are not visited and their text not repeated
+        for child in element.children:
+            if not isinstance(child, Tag):
+                continue
+            if child.name in tags:
+                if text := child.get_text(" ", strip=True):
+                    text_parts.append(text)
+            else:
+                self._collect_text(child, tags, text_parts)
@@ -1,90 +1,61 @@
 import logging
-from typing import List
 
 from app.scrapers.utils import convert_date
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .base import BaseScraper, Job
+from .base import AnyOf, BaseScraper, Job, class_pattern, parse_html
+from .spec import DescriptionSpec, ExtractionSpec, FieldSpec
 
 logger = logging.getLogger(__name__)
 
 
 class ZaposliMe(BaseScraper):
     BASE_URL = "https://zaposli.me"
+    SOURCE = "zaposli.me"
+    LISTING_PARSE_ONLY = SoupStrainer(
+        "div", class_="d-flex align-items-center justify-content-between"
+    )
+    # Expiry date is the next span after span.ms-4, so all spans are kept
+    DETAIL_PARSE_ONLY = AnyOf(
+        SoupStrainer("span"), SoupStrainer("div", id="description")
+    )
+    PAGINATION_PARSE_ONLY = SoupStrainer("li", class_=class_pattern("page-item"))
+
+    SPEC = ExtractionSpec(
+        card="div.d-flex.align-items-center.justify-content-between",
+        fields={
+            "title": FieldSpec("h3.text-primary-hover"),
+            "company": FieldSpec("h6"),
+            "url": FieldSpec("a", attr="href", required=True),
+            "img": FieldSpec("img.rounded.img-4by3-lg", attr="src", required=True),
+            "date_posted": FieldSpec("li.list-inline-item"),
+            "location": FieldSpec("li.list-inline-item", index=1),
+        },
+        detail_fields={"expires": FieldSpec("span.ms-4", following="span")},
+        description=DescriptionSpec(
+            containers=("div#description",), tags=("span", "li", "strong")
+        ),
+    )
 
     def _build_url(self, page: int) -> str:
         params: str = f"/oglasi-za-posao?page={page}"
         return self.BASE_URL + params
 
-    def _parse_listing(self, html: str) -> List[Job]:
-        jobs: List = []
-        soup = BeautifulSoup(html, "html.parser")
-        job_cards = soup.find_all(
-            "div", class_="d-flex align-items-center justify-content-between"
-        )
-
-        for card in job_cards:
-            try:
-                job = self._parse_job_details(card)
-                jobs.append(job)
-
-            except Exception as e:
-                logger.warning(f"Error parsing job for zaposlime: {e}")
-                continue
-
-        return jobs
-
-    def _parse_job_details(self, card) -> Job:
-        title_elem = card.find("h3", class_="text-primary-hover")
-        title = title_elem.get_text(strip=True) if title_elem else "N/A"
-
-        company_elem = card.find("h6")
-        company = company_elem.get_text(strip=True) if company_elem else "N/A"
-
-        url_elem = card.find("a")["href"]
-        url = self.BASE_URL + url_elem if url_elem else "N/A"
-
-        img = card.find("img", class_="rounded img-4by3-lg")["src"]
-
-        items = card.find_all("li", class_="list-inline-item")
-        location = items[1].get_text(strip=True) if items else "N/A"
-        date_posted = items[0].get_text(strip=True) if items else "N/A"
-        date_posted_object = convert_date(date_posted)
+    def _parse_card(self, card) -> dict:
+        fields = self.SPEC.extract_card(card)
+        fields["url"] = self.BASE_URL + fields["url"]
+        fields["date_posted"] = convert_date(fields["date_posted"])
+        return fields
 
-        detail_html = self.session.get(url, timeout=10).text
-        detail_soup = BeautifulSoup(detail_html, "html.parser")
-
-        expires_elem = detail_soup.find("span", class_="ms-4").find_next("span")
-        expires = expires_elem.get_text(strip=True) if expires_elem else "N/A"
-        expires_date_object = convert_date(expires)
-
-        if description_div := detail_soup.find("div", id="description"):
-            text_parts: list = []
-
-            for span in description_div.find_all("span"):
-                if text := span.get_text(strip=True):
-                    text_parts.append(text)
-
-            for li in description_div.find_all("li"):
-                if text := li.get_text(strip=True):
-                    text_parts.append(text)
-
-            for strong in description_div.find_all("strong"):
-                if text := strong.get_text(strip=True):
-                    text_parts.append(text)
-
-            description: str = " ".join(text_parts)
+    def _parse_job_details(self, card: dict, detail_html: str | None) -> Job:
+        detail_soup = parse_html(detail_html, self.DETAIL_PARSE_ONLY)
+        details = self.SPEC.extract_detail(detail_soup)
 
         return Job(
-            title=title,
-            company=company,
-            url=url,
-            location=location,
-            date_posted=date_posted_object,
-            expires=expires_date_object,
-            source="zaposli.me",
-            img=img,
-            description=description,
+            **card,
+            expires=convert_date(details["expires"]),
+            source=self.SOURCE,
+            description=self.SPEC.extract_description(detail_soup),
         )
 
     def last_page_number(self) -> int | None:
@@ -93,14 +64,10 @@ class ZaposliMe(BaseScraper):
         if not html:
             return None
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = parse_html(html, self.PAGINATION_PARSE_ONLY)
         pagination_items = soup.find_all("li", class_="page-item")
         last_page_str = (
             pagination_items[-2].get_text(strip=True) if pagination_items else None
         )
         if last_page_str:
             return int(last_page_str)
-
-
-_zaposlime = ZaposliMe()
-last_page_number = _zaposlime.last_page_number()
@@ -1,93 +1,78 @@
 import logging
 from datetime import date
-from typing import List
 
 from app.scrapers.utils import convert_date
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .base import BaseScraper, Job, requests
+from .base import BaseScraper, Job, class_pattern, parse_html
+from .spec import DescriptionSpec, ExtractionSpec, FieldSpec
 
 logger = logging.getLogger(__name__)
 
 
 class ZzzCg(BaseScraper):
     BASE_URL = "https://www.zzzcg.me/"
+    SOURCE = "zzzcg.me"
+    LISTING_PARSE_ONLY = SoupStrainer("div", class_=class_pattern("e-loop-item"))
+    DETAIL_PARSE_ONLY = SoupStrainer(
+        "div",
+        class_=class_pattern(
+            "elementor-element-36daa85",
+            "elementor-element-a9bb732",
+            "elementor-element-d32f17e",
+            "rokzaprijavu",
+        ),
+    )
+
+    SPEC = ExtractionSpec(
+        card="div.e-loop-item",
+        fields={
+            "title": FieldSpec("h3.elementor-heading-title"),
+            "url": FieldSpec("a.elementor-element", attr="href", required=True),
+            "company": FieldSpec("li.elementor-icon-list-item"),
+            "location": FieldSpec("li.elementor-icon-list-item", index=1),
+            "date_posted": FieldSpec("li.elementor-icon-list-item", index=2),
+        },
+        detail_fields={"expires": FieldSpec("div.rokzaprijavu")},
+        description=DescriptionSpec(
+            containers=(
+                "div.elementor-element-36daa85",
+                "div.elementor-element-a9bb732",
+                "div.elementor-element-d32f17e",
+            )
+        ),
+    )
 
     def _build_url(self, page: int) -> str:
         params: str = f"srm/?e-page-740d986={page}"
         return self.BASE_URL + params
 
-    def _parse_listing(self, html: str) -> List[Job]:
-        jobs: List = []
-        soup = BeautifulSoup(html, "html.parser")
-        job_cards = soup.find_all(
-            "div",
-            class_="e-loop-item",
+    def _parse_card(self, card) -> dict:
+        fields = self.SPEC.extract_card(card)
+        fields["date_posted"] = convert_date(
+            fields["date_posted"], source="zzzcg", date_source="date posted"
         )
+        return fields
 
-        for card in job_cards:
-            try:
-                job: Job | None = self._parse_job_details(card=card)
-                if job:
-                    jobs.append(job)
+    def _parse_job_details(self, card: dict, detail_html: str | None) -> Job | None:
+        detail_soup = parse_html(detail_html, self.DETAIL_PARSE_ONLY)
+        details = self.SPEC.extract_detail(detail_soup)
 
-            except Exception as e:
-                logger.warning(f"Error parsing job for zzzcg: {e}")
-                continue
-
-        return jobs
-
-    def _parse_job_details(self, card) -> Job | None:
-        title_elem = card.find("h3", class_="elementor-heading-title")
-        title = title_elem.get_text(strip=True) if title_elem else "N/A"
-
-        url = card.find("a", class_="elementor-element")["href"]
-
-        items = card.find_all("li", class_="elementor-icon-list-item")
-        company = items[0].get_text(strip=True) if items else "N/A"
-        location = items[1].get_text(strip=True) if items else "N/A"
-        date_posted = items[2].get_text(strip=True) if items else "N/A"
-        date_posted_object = convert_date(
-            date_posted, source="zzzcg", date_source="date posted"
-        )
-
-        detail_html = self.session.get(url, timeout=10).text
-        detail_soup = BeautifulSoup(detail_html, "html.parser")
-
-        text_parts: list = []
-        if desc_text_1 := detail_soup.find("div", class_="elementor-element-36daa85"):
-            if text := desc_text_1.get_text(strip=True):
-                text_parts.append(text)
-
-        if desc_text_2 := detail_soup.find("div", class_="elementor-element-a9bb732"):
-            if text := desc_text_2.get_text(strip=True):
-                text_parts.append(text)
-
-        if desc_text_3 := detail_soup.find("div", class_="elementor-element-d32f17e"):
-            if text := desc_text_3.get_text(strip=True):
-                text_parts.append(text)
-
-        description: str = " ".join(text_parts)
-
-        expires_elem = detail_soup.select_one("div.rokzaprijavu")
-        expires = expires_elem.get_text(strip=True) if expires_elem else "N/A"
-        expires_str = expires.replace("Važi do:", "")
+        expires_str = details["expires"].replace("Važi do:", "")
         expires_date_object = convert_date(
             expires_str, source="zzzcg", date_source="expires"
         )
 
         if expires_date_object and expires_date_object < date.today():
-            logger.warning(f"Job is expired, skipping: {title}:{expires_date_object}")
+            logger.warning(
+                f"Job is expired, skipping: {card['title']}:{expires_date_object}"
+            )
             return None
 
         return Job(
-            title=title,
-            company=company,
-            location=location,
-            url=url,
-            date_posted=date_posted_object,
+            **card,
             expires=expires_date_object,
-            source="zzzcg.me",
+            source=self.SOURCE,
             img="",
-            description=description,
+            description=self.SPEC.extract_description(detail_soup),
         )
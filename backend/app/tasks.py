@@ -1,34 +1,88 @@
 import json
 import logging
+import math
+import os
+import time
+from collections import Counter
 from datetime import date
 
 from app.celery_app import celery_app
+from app.cities import CityResolver, get_city_resolver
+from app.classifier import (
+    KeywordClassifier,
+    changed_keywords,
+    get_classifier,
+    keyword_tsquery,
+    rule_set_version,
+)
 from app.db import SessionLocal
 from app.models import Job
-from app.models.job import Category
+from app.models.job import (
+    TITLE_TOKENS_SQL,
+    Category,
+    CategoryJobLink,
+    CategoryRuleSet,
+)
 from app.models.utils import CATEGORY_KEYWORDS
-from app.redis_app import JOB_CACHE_KEY, JOB_CACHE_TTL
+from app.redis_app import (
+    JOB_CACHE_KEY,
+    JOB_CACHE_TTL,
+    get_last_page_cache,
+    get_page_cost_cache,
+    set_last_page_cache,
+    set_page_cost_cache,
+)
 from app.redis_app import redis as redis_app
 from app.scrapers import get_scraper
+from app.scrapers.archive import SCRAPER_ARCHIVE_DIR, PageArchive
+from app.scrapers.base import CONTENT_FIELDS, BaseScraper, FetchError
 from app.scrapers.base import Job as JobCreate
-from app.scrapers.prekoveze import last_page_number as prekoveze_last_page_number
-from app.scrapers.zaposlime import last_page_number as zaposlime_last_page_number
+from app.scrapers.http_cache import SCRAPER_CACHE_DIR, HttpCache
 from celery import chord
 from celery.exceptions import SoftTimeLimitExceeded
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import bindparam, false, literal_column, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session, delete, func, select
 
 logger = logging.getLogger(__name__)
 
 
-SOURCES: dict[str, int | None] = {
-    "prekoveze": prekoveze_last_page_number if prekoveze_last_page_number else 20,
-    "zaposlime": zaposlime_last_page_number if zaposlime_last_page_number else 40,
+# Default page counts, used when source can't report its last page number
+SOURCES: dict[str, int] = {
+    "prekoveze": 20,
+    "zaposlime": 40,
     "zzzcg": 55,
-    "radnikme": 1,
+    "radnikme": 0,
     "berzarada": 4,
 }
 
+# Number of scraped jobs written to database at once
+SAVE_BATCH_SIZE: int = 50
+
+# Number of jobs classified and linked to categories at once
+CATEGORY_BATCH_SIZE: int = 1000
+
+# Number of deleted expired job titles written to the log
+EXPIRED_LOG_SAMPLE_SIZE: int = 10
+
+# Job columns covered by the content hash, rewritten when the hash changes
+CONTENT_COLUMNS: list[str] = list(CONTENT_FIELDS)
+
+# Max urls looked up in one query, keeps IN lists and fetched rows bounded
+KNOWN_JOBS_CHUNK_SIZE: int = 500
+
+# Number of scraping tasks running in parallel, big sources are split into
+# page range shards so that all of them are kept busy
+SCRAPE_WORKERS: int = int(os.getenv("SCRAPE_WORKERS", "4"))
+# Shards planned per worker, more smaller shards even out the finish times
+SHARDS_PER_WORKER: int = 2
+
+# Seconds a listing page is expected to take before a run has measured it,
+# page of a source that fetches detail page of every card costs far more
+DEFAULT_PAGE_COST: float = 10.0
+LISTING_ONLY_PAGE_COST: float = 1.0
+
 
 @celery_app.task(
     name="app.tasks.scrape_single_source",
@@ -37,35 +91,78 @@ SOURCES: dict[str, int | None] = {
     soft_time_limit=7000,
     time_limit=7300,
 )
-def scrape_single_source(self, source: str, max_pages: int):
-    """Scrape a single job source"""
-    logger.info(f"Starting scraping job for {source}")
+def scrape_single_source(self, source: str, max_pages: int, start_page: int = 0):
+    """Scrape listing pages start_page to max_pages of a job source, saving
+    jobs in batches as pages come in"""
+    logger.info(f"Starting scraping job for {source}, pages {start_page}-{max_pages}")
 
     session = SessionLocal()
+    save_counts: Counter = Counter()
+    # Ids of saved and updated jobs, later stages only look at these
+    changed_ids: list[int] = []
+    pages_count: int = 0
+    batch: list[JobCreate] = []
+    started = time.monotonic()
 
     try:
         try:
             scraper = get_scraper(scraper=source)
-            jobs = scraper.scrape(max_pages=max_pages)
-
-            if jobs:
-                existing_by_url = get_existing_jobs_url(jobs, session)
-                save_jobs(jobs, existing_by_url, session)
-
-            logger.info(f"Job scraping completed. Results: {len(jobs) if jobs else 0}")
+            pages = scraper.stream(
+                max_pages=max_pages,
+                known_jobs=lambda urls, fields: get_known_jobs(urls, fields, session),
+                start_page=start_page,
+            )
+
+            for page_jobs in pages:
+                pages_count += 1
+                batch.extend(page_jobs)
+
+                while len(batch) >= SAVE_BATCH_SIZE:
+                    save_counts.update(
+                        persist_jobs(batch[:SAVE_BATCH_SIZE], session, changed_ids)
+                    )
+                    batch = batch[SAVE_BATCH_SIZE:]
+
+            save_counts.update(persist_jobs(batch, session, changed_ids))
+            record_page_cost(source, time.monotonic() - started, pages_count)
+
+            logger.info(f"Job scraping completed. Results: {dict(save_counts)}")
             return {
                 "source": source,
-                "jobs_count": len(jobs) if jobs else 0,
+                "start_page": start_page,
+                "pages_count": pages_count,
+                "jobs_count": save_counts.total(),
+                **save_counts,
+                "changed_ids": changed_ids,
                 "status": "success",
+                "cache": scraper.cache_stats,
+                "fetch": scraper.fetch_stats(),
             }
 
         except SoftTimeLimitExceeded:
             logger.warning(f"Soft timeout while scraping {source}")
+            # Keep jobs scraped before the timeout that are not saved yet
+            session.rollback()
+            save_counts.update(persist_jobs(batch, session, changed_ids))
             return {
                 "source": source,
-                "jobs_count": 0,
+                "jobs_count": save_counts.total(),
+                **save_counts,
+                "changed_ids": changed_ids,
                 "status": "timeout",
             }
+        except FetchError as e:
+            # Portal keeps failing, give up on it instead of retrying the task
+            logger.error(f"Giving up on {source}: {e}")
+            save_counts.update(persist_jobs(batch, session, changed_ids))
+            return {
+                "source": source,
+                "jobs_count": save_counts.total(),
+                **save_counts,
+                "changed_ids": changed_ids,
+                "status": "failed",
+                "error": str(e),
+            }
         except (TimeoutError, ConnectionError) as e:
             logger.error(f"Error while scpaing {source}: {e}")
             raise self.retry(exc=e, countdown=300)
@@ -75,11 +172,27 @@ def scrape_single_source(self, source: str, max_pages: int):
 
 @celery_app.task(name="app.tasks.scrape_all_jobs")
 def scrape_all_jobs():
-    """Coordinator taks that triggers all scrapers in parralel"""
+    """Coordinator taks that splits sources into shards and triggers them in
+    parralel, callback runs after all shards complete"""
+    last_pages: dict[str, int] = {}
+    page_costs: dict[str, float] = {}
+
+    for source, default in SOURCES.items():
+        scraper = get_scraper(scraper=source)
+        if not scraper.PAGINATED:
+            # Any page number fetches the same listing, so it is one shard
+            last_pages[source] = 0
+        else:
+            last_pages[source] = get_last_page_number(source, scraper, default=default)
+        page_costs[source] = get_page_cost(source, scraper)
+
+    shards = plan_shards(last_pages, page_costs, workers=SCRAPE_WORKERS)
+    logger.info(f"Scraping {len(SOURCES)} sources in {len(shards)} shards")
+
     job = chord(
         (
-            scrape_single_source.s(source, max_pages)
-            for source, max_pages in SOURCES.items()
+            scrape_single_source.s(source, last_page, start_page)
+            for source, start_page, last_page in shards
         ),
         (
             cleanup_expired_jobs.s()
@@ -93,14 +206,27 @@ def scrape_all_jobs():
 
 @celery_app.task(name="app.tasks.cleanup_expired_jobs")
 def cleanup_expired_jobs(results):
-    """Runs after all scrapers complete to delete expired jobs"""
+    """Runs after all scrapers complete to delete expired jobs, collects ids
+    of changed jobs from the shard results for the following stages"""
     session = SessionLocal()
     try:
-        delete_expired_ones_from_database(session)
+        expired = delete_expired_ones_from_database(session)
         logger.info("Cleanup finished")
     finally:
         session.close()
 
+    deleted_ids = set(expired["deleted_ids"])
+    changed_ids = sorted(
+        {job_id for result in results for job_id in result.get("changed_ids", [])}
+        - deleted_ids
+    )
+    logger.info(f"{len(changed_ids)} jobs saved or updated by scrapers")
+    return {
+        "changed_ids": changed_ids,
+        "expired_count": len(deleted_ids),
+        "expired_sample": expired["sample"],
+    }
+
 
 @celery_app.task(name="app.tasks.delete_duplicated_jobs")
 def delete_duplicated_jobs(results):
@@ -115,6 +241,8 @@ def delete_duplicated_jobs(results):
     finally:
         session.close()
 
+    return results
+
 
 @celery_app.task(name="app.tasks.cache_all_jobs")
 def cache_all_jobs(results):
@@ -134,104 +262,433 @@ def cache_all_jobs(results):
     finally:
         session.close()
 
+    return results
+
 
 @celery_app.task(name="app.tasks.assign_categories_to_jobs")
 def assign_categories_to_jobs(results):
+    """Assign categories to jobs saved or updated by the scrapers, and to jobs
+    that a changed category rule set could classify differently. All jobs
+    are classified when called without changed job ids"""
+    changed_ids = results.get("changed_ids") if isinstance(results, dict) else None
+    classifier = get_classifier()
     session = SessionLocal()
 
     try:
-        categories = session.exec(select(Category)).all()
-        category_map: dict = {cat.name: cat for cat in categories}
-
-        jobs = session.exec(select(Job)).all()
+        reclassified = sync_category_rule_set(classifier, session)
+        category_ids = dict(session.exec(select(Category.name, Category.id)).all())
 
-        for job in jobs:
-            job_title_lower: str = job.title.lower()
-            matched_categories: list = []
-
-            for category_name, keywords in CATEGORY_KEYWORDS.items():
-                for keyword in keywords:
-                    if keyword.lower() in job_title_lower:
-                        if category_name in category_map:
-                            category = category_map[category_name]
-
-                            if category not in matched_categories:
-                                matched_categories.append(category)
-                        break
+        query = select(Job.id, Job.title, Job.description).execution_options(
+            yield_per=CATEGORY_BATCH_SIZE
+        )
+        if changed_ids is not None and reclassified is not None:
+            query = query.where(or_(Job.id.in_(changed_ids), reclassified))
 
-            if matched_categories:
-                job.categories = matched_categories
-                session.add(job)
+        jobs_count = links_count = 0
+        for jobs in session.exec(query).partitions():
+            jobs_count += len(jobs)
+            links_count += link_categories(jobs, category_ids, classifier, session)
 
         session.commit()
+        logger.info(
+            f"Assigned {links_count} categories to {jobs_count} jobs "
+            f"with rule set {classifier.version[:12]}"
+        )
 
     except Exception as e:
+        session.rollback()
         logger.warning(f"Error while assigning category: {e}")
 
     finally:
         session.close()
 
+    return results
 
-def save_jobs(jobs: list[JobCreate], existing_by_url: dict, session: Session) -> None:
-    saved: int = 0
-    updated: int = 0
-    skipped: int = 0
 
-    for job_data in jobs:
-        existing = existing_by_url.get(job_data.url)
+@celery_app.task(name="app.tasks.prune_scraper_caches")
+def prune_scraper_caches():
+    """Delete entries of the scrapers' HTTP cache that were not used lately
+    and archived pages past their retention"""
+    if SCRAPER_CACHE_DIR:
+        deleted = HttpCache().prune()
+        logger.info(f"Pruned {deleted} HTTP cache entries")
+    if SCRAPER_ARCHIVE_DIR:
+        deleted = PageArchive().prune()
+        logger.info(
+            f"Pruned {deleted['days']} archive days, {deleted['objects']} pages"
+        )
 
-        if existing is None:
-            try:
-                session.add(Job(**job_data.model_dump()))
-                session.commit()
-                saved += 1
-            except IntegrityError:
-                session.rollback()
-                logger.warning(f"Duplicated URL skipped: {job_data.url}")
-            continue
-
-        is_updated: bool = False
-
-        if existing.expires != job_data.expires:
-            existing.expires = job_data.expires
-            existing.description = job_data.description
-            is_updated = True
-
-        if is_updated:
-            try:
-                session.add(existing)
-                session.commit()
-                updated += 1
-            except IntegrityError:
-                session.rollback()
-                skipped += 1
 
-    logger.info(f"Saved {saved}, Updated: {updated}, Skipped: {skipped}")
+@celery_app.task(name="app.tasks.resolve_job_cities")
+def resolve_job_cities():
+    """Resolve city of all stored jobs with the current city aliases, an
+    unchanged job is never rewritten by the scrapers to pick up a new alias"""
+    session = SessionLocal()
+    try:
+        cities = get_city_resolver(session, max_age=0)
+        updated = update_job_cities(cities, session)
+        logger.info(f"City of {updated} jobs updated")
+    finally:
+        session.close()
+
+    if updated:
+        cache_all_jobs(None)
+
+
+def sync_category_rule_set(classifier: KeywordClassifier, session: Session):
+    """Function to store the classifier's rule set when it is new
+
+    Args:
+        classifier(KeywordClassifier): classifier about to assign categories
+        session(Session): database session, caller commits
+
+    Returns:
+        condition on jobs whose categories the new rule set could change,
+        None when all jobs have to be classified again
+    """
+    latest = session.exec(
+        select(CategoryRuleSet).order_by(CategoryRuleSet.id.desc()).limit(1)
+    ).first()
+    if latest and latest.version == classifier.version:
+        return false()
+
+    model_version = classifier.model.version if classifier.model else None
+    session.add(
+        CategoryRuleSet(
+            version=classifier.version,
+            keywords=classifier.keywords,
+            whole_words=sorted(classifier.whole_words),
+            model_version=model_version,
+        )
+    )
+    existing = set(session.exec(select(Category.name)).all())
+    session.add_all(
+        Category(name=name) for name in classifier.keywords if name not in existing
+    )
+    session.flush()
 
+    if latest is None:
+        logger.info("No category rule set stored yet, classifying all jobs")
+        return None
 
-def get_existing_jobs_url(jobs: list[JobCreate], session) -> dict:
-    urls = [job.url for job in jobs]
-    existing_jobs = session.exec(select(Job).where(Job.url.in_(urls))).all()
-    return {job.url: job for job in existing_jobs}
+    if latest.whole_words is None:
+        logger.info("Stored rule set has no whole word keywords, classifying all")
+        return None
 
+    # Model can change any job's category. Rule sets stored before the model
+    # version was kept hold None, their version tells whether they had a model
+    old_version = rule_set_version(
+        latest.keywords, latest.whole_words, latest.model_version
+    )
+    if latest.model_version != model_version or latest.version != old_version:
+        logger.info("Category model changed, classifying all jobs")
+        return None
+
+    # Keyword that became or stopped being whole word matches other titles,
+    # it is looked up as a prefix to find titles matched by either rule
+    old_whole_words = {keyword.lower() for keyword in latest.whole_words}
+    toggled = old_whole_words ^ classifier.whole_words
+    keywords = changed_keywords(latest.keywords, classifier.keywords) | toggled
+    if not keywords:
+        # Same keywords with other matching rules, any title can be affected
+        logger.info("Category matching rules changed, classifying all jobs")
+        return None
+
+    logger.info(f"Category keywords changed: {sorted(keywords)}")
+    tsquery = keyword_tsquery(keywords, old_whole_words & classifier.whole_words)
+    title_tokens = literal_column(TITLE_TOKENS_SQL)
+    return title_tokens.op("@@")(func.to_tsquery(literal_column("'simple'"), tsquery))
+
+
+def link_categories(
+    jobs: list[tuple[int, str, str | None]],
+    category_ids: dict[str, int],
+    classifier: KeywordClassifier,
+    session: Session,
+) -> int:
+    """Function to replace category links of jobs with the classified ones
+
+    Args:
+        jobs(list): id, title and description of jobs to classify
+        category_ids(dict): category name to id of categories in database
+        classifier(KeywordClassifier): classifier of the current rule set
+        session(Session): database session, caller commits
+
+    Returns:
+        number of links written
+    """
+    job_ids = [job_id for job_id, _, _ in jobs]
+    classified = classifier.classify_jobs([(title, desc) for _, title, desc in jobs])
+    links = [
+        {"job_id": job_id, "category_id": category_ids[name]}
+        for job_id, names in zip(job_ids, classified)
+        for name in names
+        if name in category_ids
+    ]
+
+    session.execute(delete(CategoryJobLink).where(CategoryJobLink.job_id.in_(job_ids)))
+    if links:
+        session.execute(insert(CategoryJobLink.__table__), links)
+    session.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids))
+        .values(category_version=classifier.version)
+    )
+    return len(links)
+
+
+def persist_jobs(
+    jobs: list[JobCreate], session: Session, changed_ids: list[int]
+) -> dict[str, int]:
+    """Save batch of scraped jobs and return saved, updated and unchanged
+    counts, ids of saved and updated jobs are added to changed_ids"""
+    if not jobs:
+        return {}
+
+    counts = save_jobs(jobs, session)
+    changed_ids.extend(counts.pop("changed_ids"))
+    logger.info(
+        f"Saved {counts['saved']}, Updated: {counts['updated']}, "
+        f"Unchanged: {counts['unchanged']}"
+    )
+    return counts
+
+
+def save_jobs(jobs: list[JobCreate], session: Session) -> dict:
+    """Function to insert new jobs and update changed ones in one statement
+
+    Jobs are compared by content hash, a stored job with the same hash is
+    not written at all.
+
+    Args:
+        jobs(list): scraped jobs, when url repeats the last job is kept
+        session(Session): database session, batch is committed at once
+
+    Returns:
+        numbers of saved, updated and unchanged jobs, and ids of saved and
+        updated ones under changed_ids
+    """
+    cities = get_city_resolver(session)
+    rows = {
+        job.url: {
+            **job.model_dump(exclude={"id"}),
+            "city_id": cities.resolve(job.location),
+        }
+        for job in jobs
+    }
+
+    # Statement without values is compiled once and cached, rows are sent as
+    # parameters and batched into multi-row inserts by the driver
+    stmt = insert(Job.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Job.url],
+        set_={
+            column: stmt.excluded[column]
+            for column in CONTENT_COLUMNS + ["content_hash", "city_id"]
+        },
+        # city_id is not hashed, a job rewritten with a new alias gets its city
+        # here. Jobs not scraped again are updated by resolve_job_cities
+        where=or_(
+            Job.content_hash.is_distinct_from(stmt.excluded.content_hash),
+            Job.city_id.is_distinct_from(stmt.excluded.city_id),
+        ),
+    )
+    # Row inserted by this statement has no previous version, xmax = 0
+    stmt = stmt.returning(Job.id, literal_column("xmax = 0"))
 
-def delete_expired_ones_from_database(session: Session) -> None:
-    query = select(Job).where(
-        Job.expires.is_not(None),  # type: ignore
-        Job.expires < date.today(),  # type: ignore
+    try:
+        written = session.execute(stmt, list(rows.values())).all()
+        session.commit()
+    except SQLAlchemyError:
+        session.rollback()
+        raise
+
+    saved = sum(1 for _, inserted in written if inserted)
+    updated = len(written) - saved
+    return {
+        "saved": saved,
+        "updated": updated,
+        "unchanged": len(rows) - saved - updated,
+        "changed_ids": [job_id for job_id, _ in written],
+    }
+
+
+def get_last_page_number(source: str, scraper: BaseScraper, default: int) -> int:
+    """Return last listing page of the source, cached in redis between runs"""
+    if last_page := get_last_page_cache(source):
+        return last_page
+
+    try:
+        last_page = scraper.last_page_number()
+    except FetchError as e:
+        logger.warning(f"Last page of {source} unknown: {e}")
+        return default
+
+    if not last_page:
+        return default
+
+    set_last_page_cache(source, last_page)
+    return last_page
+
+
+def get_page_cost(source: str, scraper: BaseScraper) -> float:
+    """Return seconds a listing page of the source took in previous runs"""
+    if page_cost := get_page_cost_cache(source):
+        return page_cost
+    return DEFAULT_PAGE_COST if scraper.FETCH_DETAILS else LISTING_ONLY_PAGE_COST
+
+
+def record_page_cost(source: str, seconds: float, pages_count: int) -> None:
+    if not pages_count:
+        return
+
+    page_cost = seconds / pages_count
+    # Shards of one run finish one after another, average smooths them out
+    if previous := get_page_cost_cache(source):
+        page_cost = (previous + page_cost) / 2
+    set_page_cost_cache(source, page_cost)
+
+
+def plan_shards(
+    last_pages: dict[str, int], page_costs: dict[str, float], workers: int
+) -> list[tuple[str, int, int]]:
+    """Function to split sources into page ranges of about equal cost
+
+    Args:
+        last_pages(dict): source to number of its last listing page
+        page_costs(dict): source to estimated seconds per listing page
+        workers(int): number of scraping tasks running in parallel
+
+    Returns:
+        list of (source, start page, last page) shards, costliest first so
+        they are picked up before the short ones
+    """
+    costs = {
+        source: (last_page + 1) * page_costs[source]
+        for source, last_page in last_pages.items()
+    }
+    target_cost = sum(costs.values()) / max(workers * SHARDS_PER_WORKER, 1)
+
+    shards: list[tuple[float, tuple[str, int, int]]] = []
+    for source, last_page in last_pages.items():
+        pages = last_page + 1
+        count = min(pages, max(1, math.ceil(costs[source] / target_cost)))
+
+        for i in range(count):
+            start_page = i * pages // count
+            end_page = (i + 1) * pages // count - 1
+            shard_cost = (end_page - start_page + 1) * page_costs[source]
+            shards.append((shard_cost, (source, start_page, end_page)))
+
+    shards.sort(key=lambda shard: shard[0], reverse=True)
+    return [shard for _, shard in shards]
+
+
+def update_job_cities(cities: CityResolver, session: Session) -> int:
+    """Function to set city of stored jobs to the one their location resolves to
+
+    Each distinct location is resolved once and its jobs updated together,
+    only jobs whose city changes are written.
+
+    Args:
+        cities(CityResolver): resolver with the current aliases
+        session(Session): database session, changes are committed at once
+
+    Returns:
+        number of updated jobs
+    """
+    locations = session.exec(select(Job.location).distinct()).all()
+    params = [
+        {"job_location": location, "job_city_id": cities.resolve(location)}
+        for location in locations
+    ]
+    if not params:
+        return 0
+
+    stmt = (
+        update(Job.__table__)
+        .where(
+            Job.location == bindparam("job_location"),
+            Job.city_id.is_distinct_from(bindparam("job_city_id")),
+        )
+        .values(city_id=bindparam("job_city_id"))
     )
-    jobs_to_delete = session.exec(query).all()
+    try:
+        result = session.execute(stmt, params)
+        session.commit()
+    except SQLAlchemyError:
+        session.rollback()
+        raise
+    return result.rowcount
+
+
+def get_known_jobs(
+    urls: list[str], fields: list[str], session: Session
+) -> dict[str, dict]:
+    """Function to look up which of the scraped urls are already stored
+
+    Only url and the requested columns are read, urls are looked up in
+    chunks through the unique url index, so cost follows the number of
+    scraped urls and not the number of jobs stored for the source.
+
+    Args:
+        urls(list): urls of scraped job cards
+        fields(list): content columns the cards hold, compared by scraper
+        session(Session): database session
+
+    Returns:
+        url to stored values of the fields, for the stored ones
+    """
+    known: dict[str, dict] = {}
+    unique_urls = list(dict.fromkeys(urls))
+    columns = [getattr(Job, field) for field in fields]
+
+    for i in range(0, len(unique_urls), KNOWN_JOBS_CHUNK_SIZE):
+        chunk = unique_urls[i : i + KNOWN_JOBS_CHUNK_SIZE]
+        rows = session.exec(select(Job.url, *columns).where(Job.url.in_(chunk)))
+        for url, *values in rows:
+            known[url] = dict(zip(fields, values))
+
+    return known
 
-    if jobs_to_delete:
-        for job in jobs_to_delete:
-            logger.info(f"Deleted expired job: {job.title}, expired: {job.expires}")
-            session.delete(job)
 
+def delete_expired_ones_from_database(session: Session) -> dict:
+    """Function to delete expired jobs and their category links
+
+    Both deletes run in the database and use the index on expires, so the
+    cost follows the number of expired jobs and not the size of the table.
+
+    Args:
+        session(Session): database session, deletes are committed at once
+
+    Returns:
+        ids of deleted jobs and a sample of their titles for logging
+    """
+    is_expired = Job.expires < date.today()  # type: ignore
+
+    try:
+        # Links go first, they reference the jobs
+        session.execute(
+            delete(CategoryJobLink).where(
+                CategoryJobLink.job_id.in_(select(Job.id).where(is_expired))
+            )
+        )
+        deleted = session.execute(
+            delete(Job).where(is_expired).returning(Job.id, Job.title)
+        ).all()
         session.commit()
-        logger.info(f"Deleted {len(jobs_to_delete)} expired jobs")
+    except SQLAlchemyError:
+        session.rollback()
+        raise
+
+    sample = [title for _, title in deleted[:EXPIRED_LOG_SAMPLE_SIZE]]
+    if deleted:
+        logger.info(f"Deleted {len(deleted)} expired jobs, e.g. {sample}")
     else:
         logger.info("No expired jobs to delete")
 
+    return {"deleted_ids": [job_id for job_id, _ in deleted], "sample": sample}
+
 
 def create_all_categories_in_db():
     session = SessionLocal()
@@ -0,0 +1,107 @@
+"""Benchmark of HTML parsing per scraper on synthetic fixture pages.
+
+The fixtures are hand-written pages holding the markup each scraper reads,
+not saved copies of the portals, so the timings only show the relative cost
+of the parser backends. Compares the old way of parsing (whole page with
+html.parser) with every available parser backend, parsing the whole page
+and only the parts the scraper reads. Run from the backend directory:
+
+    python -m benchmarks.parse --runs 10
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from app.scrapers import SCRAPER_REGISTRY, base, get_scraper_class
+from app.scrapers.base import BaseScraper
+from bs4 import BeautifulSoup, FeatureNotFound
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+BACKENDS = ["html.parser", "lxml"]
+
+
+def available_backends() -> list[str]:
+    backends = []
+    for backend in BACKENDS:
+        try:
+            BeautifulSoup("<p></p>", backend)
+        except FeatureNotFound:
+            continue
+        backends.append(backend)
+    return backends
+
+
+def make_scraper(source: str, targeted: bool) -> BaseScraper:
+    scraper = get_scraper_class(source)()
+    if not targeted:
+        scraper.LISTING_PARSE_ONLY = None
+        scraper.DETAIL_PARSE_ONLY = None
+    return scraper
+
+
+def read_fixture(source: str, page: str) -> str | None:
+    path = FIXTURES_DIR / source / f"{page}.html"
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+def time_config(
+    source: str, page: str, backend: str, targeted: bool, runs: int
+) -> tuple:
+    """Time parsing of one fixture page and return seconds per page and result"""
+    base.HTML_PARSER = backend
+    scraper = make_scraper(source, targeted)
+    listing = read_fixture(source, "listing")
+
+    if page == "listing":
+        parse = lambda: scraper._parse_listing(listing)  # noqa: E731
+    else:
+        card = scraper._parse_listing(listing)[0]
+        detail = read_fixture(source, "detail")
+        parse = lambda: scraper._parse_job_details(card, detail)  # noqa: E731
+
+    result = parse()
+    seconds = min(timeit.repeat(parse, number=runs, repeat=3))
+    return seconds / runs, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--sources", nargs="*", default=list(SCRAPER_REGISTRY))
+    args = parser.parse_args()
+
+    configs = [(backend, False) for backend in available_backends()] + [
+        (backend, True) for backend in available_backends()
+    ]
+    header = ["page"] + [
+        f"{backend}/{'targeted' if targeted else 'full'}"
+        for backend, targeted in configs
+    ]
+    print(" | ".join(f"{column:>20}" for column in header + ["speedup"]))
+
+    for source in args.sources:
+        for page in ("listing", "detail"):
+            if not read_fixture(source, page):
+                continue
+
+            results = [
+                time_config(source, page, backend, targeted, args.runs)
+                for backend, targeted in configs
+            ]
+            baseline, expected = results[0]
+            best = min(seconds for seconds, _ in results)
+
+            row = [f"{source} {page}"]
+            row += [f"{seconds * 1000:.2f} ms" for seconds, _ in results]
+            row.append(f"{baseline / best:.1f}x")
+            print(" | ".join(f"{column:>20}" for column in row))
+
+            for (backend, targeted), (_, result) in zip(configs, results):
+                if result != expected:
+                    print(f"  ! {backend} targeted={targeted} parsed different result")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Stand-in job portal server serving fixture pages at the portals' url shapes.
+
+Urls are prefixed with the portal host, so with SCRAPER_URL_REWRITE set to
+the server url https://prekoveze.me/oglasi-za-posao?page=2 is served from
+http://127.0.0.1:8765/prekoveze.me/oglasi-za-posao?page=2. Run from the
+backend directory:
+
+    python -m benchmarks.portal_server --port 8765 --pages 5 --latency-ms 50
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Job ids of listing page n are shifted by n * PAGE_ID_STEP, so every page
+# lists different jobs
+PAGE_ID_STEP = 100_000
+
+
+@dataclass(frozen=True)
+class Portal:
+    # Fixture directory of the portal
+    fixtures: str
+    listing_path: str
+    # Query parameter holding listing page number, None for single page portal
+    page_param: str | None
+    # Job id inside detail page url, both in listing hrefs and requested paths
+    job_id: re.Pattern
+
+
+PORTALS: dict[str, Portal] = {
+    "prekoveze.me": Portal(
+        "prekoveze",
+        "/oglasi-za-posao",
+        "page",
+        re.compile(r"(?<=/oglasi-za-posao/)\d+"),
+    ),
+    "zaposli.me": Portal(
+        "zaposlime", "/oglasi-za-posao", "page", re.compile(r"(?<=/oglas/)\d+")
+    ),
+    "www.zzzcg.me": Portal(
+        "zzzcg", "/srm/", "e-page-740d986", re.compile(r"(?<=/oglasi/)\d+")
+    ),
+    "radnik.me": Portal(
+        "radnikme", "/oglasi-za-posao", None, re.compile(r"(?<=/oglasi-za-posao/)\d+")
+    ),
+    "www.berzarada.me": Portal(
+        "berzarada", "/poslovi/", "p", re.compile(r"(?<=/posao/)\d+")
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def read_fixture(source: str, page: str) -> str | None:
+    path = FIXTURES_DIR / source / f"{page}.html"
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+class PortalServer(ThreadingHTTPServer):
+    """Serves fixture pages of all portals with configurable behaviour
+
+    Args:
+        address(tuple): host and port to listen on, port 0 picks a free one
+        pages(int): number of listing pages of every portal, later pages 404
+        latency(float): seconds every response is delayed by
+        error_rate(float): share of requests answered with 503
+        seed(int): seed of the error sampling
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        pages: int = 5,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(address, PortalRequestHandler)
+        self.pages = pages
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        # Runs against the same database would see jobs of the previous run
+        # as already known and stop early, so job ids differ per server start
+        self.id_offset = random.randrange(1000) * 1000 * PAGE_ID_STEP
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def is_error(self) -> bool:
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def render(self, host: str, path: str, query: str) -> str | None:
+        """Page served for the portal url, None when there is no such page"""
+        portal = PORTALS.get(host)
+        if portal is None:
+            return None
+
+        if portal.job_id.search(path):
+            return read_fixture(portal.fixtures, "detail")
+
+        if path != portal.listing_path:
+            return None
+
+        page = 0
+        if portal.page_param:
+            values = parse_qs(query).get(portal.page_param, ["0"])
+            page = int(values[0]) if values[0].isdigit() else 0
+        if page >= self.pages:
+            return None
+
+        listing = read_fixture(portal.fixtures, "listing")
+        offset = self.id_offset + page * PAGE_ID_STEP
+        return portal.job_id.sub(lambda m: str(int(m.group()) + offset), listing)
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class PortalRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive like the real portals, scrapers reuse pooled connections
+    protocol_version = "HTTP/1.1"
+    server: PortalServer
+
+    def do_GET(self) -> None:
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if self.server.is_error():
+            self._respond(503, "Service Unavailable")
+            return
+
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        body = self.server.render(host, "/" + path, parts.query)
+
+        if body is None:
+            self._respond(404, "Not Found")
+        else:
+            self._respond(200, body)
+
+    def _respond(self, status: int, body: str) -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = PortalServer(
+        (args.host, args.port),
+        pages=args.pages,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+    )
+    print(f"Serving portals on {server.url}, set SCRAPER_URL_REWRITE={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
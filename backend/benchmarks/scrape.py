@@ -0,0 +1,96 @@
+"""End-to-end scraping benchmark against the stand-in portal server.
+
+Runs scrape_single_source for every source with fetches sent to a local
+benchmarks.portal_server, and reports request and job throughput and
+fetch latency. Jobs are saved, so point DATABASE_URL and REDIS_HOST at
+scratch instances, or pass --no-db to only run the scraper stream. Run from
+the backend directory:
+
+    python -m benchmarks.scrape --pages 5 --latency-ms 50 --error-rate 0.01
+"""
+
+import argparse
+import time
+
+from app.scrapers import SCRAPER_REGISTRY, base, get_scraper
+
+from .portal_server import PortalServer
+
+
+def run_task(source: str, pages: int) -> dict:
+    # Imported here, --no-db runs need no database or celery settings
+    from app.tasks import scrape_single_source
+
+    return scrape_single_source(source, pages - 1)
+
+
+def run_stream(source: str, pages: int) -> dict:
+    scraper = get_scraper(scraper=source)
+    jobs_count = sum(len(jobs) for jobs in scraper.stream(max_pages=pages - 1))
+    return {
+        "source": source,
+        "jobs_count": jobs_count,
+        "status": "success",
+        "fetch": scraper.fetch_stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--sources", nargs="*", default=list(SCRAPER_REGISTRY))
+    parser.add_argument(
+        "--no-db", action="store_true", help="run scraper stream without saving"
+    )
+    args = parser.parse_args()
+
+    server = PortalServer(
+        pages=args.pages,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+    )
+    server.start()
+
+    # Scrapers read these when created, the benchmark fetches every page
+    base.SCRAPER_URL_REWRITE = server.url
+    base.SCRAPER_CACHE_DIR = ""
+    base.SCRAPER_ARCHIVE_DIR = ""
+
+    header = ["source", "status", "requests", "jobs", "seconds"]
+    header += ["requests/s", "jobs/s", "p95 latency"]
+    print(" | ".join(f"{column:>12}" for column in header))
+
+    try:
+        for source in args.sources:
+            run = run_stream if args.no_db else run_task
+            started = time.perf_counter()
+            try:
+                result = run(source, args.pages)
+            except Exception as e:
+                print(f"{source:>12} | failed: {e!r}")
+                continue
+            seconds = time.perf_counter() - started
+
+            fetch = result.get("fetch") or {}
+            requests = fetch.get("requests", 0)
+            p95 = fetch.get("p95_latency")
+            row = [
+                source,
+                result["status"],
+                str(requests),
+                str(result["jobs_count"]),
+                f"{seconds:.2f}",
+                f"{requests / seconds:.1f}",
+                f"{result['jobs_count'] / seconds:.1f}",
+                f"{p95 * 1000:.1f} ms" if p95 is not None else "-",
+            ]
+            print(" | ".join(f"{column:>12}" for column in row))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()